@@ -1,24 +1,209 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response as HTTPResponse, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateMany, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from gridfs.errors import NoFile
 import os
+import io
+import csv
+import json
+import base64
+import hashlib
 import logging
+import math
+import time
+import asyncio
+import threading
+import contextvars
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel, Field, EmailStr, ValidationError
+from typing import List, Optional, Dict, Any, Generic, TypeVar
 from datetime import datetime, timedelta
 from bson import ObjectId
 import bcrypt
 import jwt
+import orjson
+from pyinstrument import Profiler
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# ===========================================
+# Metrics
+# ===========================================
+
+# Per-route request latency and status counts, and the Mongo commands each route
+# issues, exposed in Prometheus text format at /api/metrics. The command listener
+# is attached to the Mongo client below, so it's defined before it.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COMMANDS_PER_REQUEST_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Set to require `Authorization: Bearer <METRICS_TOKEN>` on /api/metrics
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+# Requests slower than this are logged with the Mongo commands they issued (0 disables)
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 1000))
+SLOW_REQUEST_MAX_COMMANDS = 50
+# Streaming routes last as long as the transfer or the open connection, so they are
+# never logged as slow
+SLOW_REQUEST_EXCLUDED_ROUTES = {
+    "/api/surveys/{survey_id}/results/stream",
+    "/api/surveys/{survey_id}/responses/export",
+    "/api/surveys/{survey_id}/responses/import",
+    "/api/jobs/{job_id}/download",
+}
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+        self.sum += value
+        self.count += 1
+
+class RequestStats:
+    """Mongo commands issued while handling one request."""
+    
+    def __init__(self):
+        self.user_role = None
+        # {"command", "collection", "filter", "seconds", "docs"} per completed command
+        self.commands = []
+        # Collection and filter of commands in flight, by (connection, request id)
+        self.started = {}
+
+# Stats of the request being handled; Motor runs pymongo calls with a copy of the
+# caller's context, so the command listener sees the request that issued them
+request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_duration = {}  # (method, route) -> Histogram
+        self.requests = {}  # (method, route, status) -> count
+        self.commands_per_request = {}  # (method, route) -> Histogram
+        self.mongo_commands = {}  # (route, command) -> [count, seconds]
+    
+    def observe_request(self, method: str, route: str, status_code: int, duration: float, stats: RequestStats):
+        with self.lock:
+            key = (method, route)
+            self.request_duration.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.commands_per_request.setdefault(key, Histogram(COMMANDS_PER_REQUEST_BUCKETS)).observe(len(stats.commands))
+            self.requests[(method, route, status_code)] = self.requests.get((method, route, status_code), 0) + 1
+            for command in stats.commands:
+                self.observe_command(route, command["command"], command["seconds"])
+    
+    def observe_command(self, route: str, command: str, seconds: float):
+        totals = self.mongo_commands.setdefault((route, command), [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+    
+    def observe_background_command(self, command: str, seconds: float):
+        with self.lock:
+            self.observe_command("background", command, seconds)
+    
+    def render(self) -> str:
+        lines = []
+        
+        def labels(**values) -> str:
+            return "{" + ",".join(f'{name}="{value}"' for name, value in values.items()) + "}"
+        
+        def histogram(name: str, help_text: str, histograms: dict):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), hist in sorted(histograms.items()):
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f"{name}_bucket{labels(method=method, route=route, le=bound)} {count}")
+                lines.append(f"{name}_bucket{labels(method=method, route=route, le='+Inf')} {hist.count}")
+                lines.append(f"{name}_sum{labels(method=method, route=route)} {hist.sum}")
+                lines.append(f"{name}_count{labels(method=method, route=route)} {hist.count}")
+        
+        with self.lock:
+            histogram("impar_http_request_duration_seconds", "HTTP request latency by route.", self.request_duration)
+            lines.append("# HELP impar_http_requests_total HTTP requests by route and status code.")
+            lines.append("# TYPE impar_http_requests_total counter")
+            for (method, route, status_code), count in sorted(self.requests.items()):
+                lines.append(f"impar_http_requests_total{labels(method=method, route=route, status=status_code)} {count}")
+            histogram("impar_mongo_commands_per_request", "Mongo commands (round trips) issued per request.", self.commands_per_request)
+            lines.append("# HELP impar_mongo_commands_total Mongo commands by route and command name.")
+            lines.append("# TYPE impar_mongo_commands_total counter")
+            for (route, command), (count, _) in sorted(self.mongo_commands.items()):
+                lines.append(f"impar_mongo_commands_total{labels(route=route, command=command)} {count}")
+            lines.append("# HELP impar_mongo_command_seconds_total Time spent in Mongo commands by route and command name.")
+            lines.append("# TYPE impar_mongo_command_seconds_total counter")
+            for (route, command), (_, seconds) in sorted(self.mongo_commands.items()):
+                lines.append(f"impar_mongo_command_seconds_total{labels(route=route, command=command)} {seconds}")
+        
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+def command_target(command_name: str, command: dict):
+    """Collection and filter (or pipeline) of a command."""
+    collection = command.get("collection") if command_name == "getMore" else command.get(command_name)
+    if command_name == "aggregate":
+        query = command.get("pipeline")
+    elif command_name in ("update", "delete"):
+        statements = command.get(command_name + "s") or [{}]
+        query = statements[0].get("q")
+    else:
+        query = command.get("filter", command.get("query"))
+    return (collection if isinstance(collection, str) else None), query
+
+def count_reply_docs(reply: dict) -> Optional[int]:
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    return reply.get("n")
+
+def query_shape(value):
+    """A filter or pipeline with its values replaced by "?", so logs carry no user data."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        return [query_shape(item) for item in value]
+    return "?"
+
+class MongoCommandListener(monitoring.CommandListener):
+    def started(self, event):
+        stats = request_stats.get()
+        if stats is not None:
+            stats.started[(event.connection_id, event.request_id)] = command_target(event.command_name, event.command)
+    
+    def succeeded(self, event):
+        self.record(event, count_reply_docs(event.reply))
+    
+    def failed(self, event):
+        self.record(event)
+    
+    def record(self, event, docs: Optional[int] = None):
+        seconds = event.duration_micros / 1e6
+        stats = request_stats.get()
+        if stats is None:
+            metrics.observe_background_command(event.command_name, seconds)
+            return
+        collection, query = stats.started.pop((event.connection_id, event.request_id), (None, None))
+        stats.commands.append({
+            "command": event.command_name,
+            "collection": collection,
+            "filter": query,
+            "seconds": seconds,
+            "docs": docs
+        })
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandListener()])
 db = client[os.environ['DB_NAME']]
 
 # JWT settings
@@ -28,8 +213,70 @@ if not SECRET_KEY:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 43200  # 30 days
 
-# Create the main app
-app = FastAPI()
+# Password hashing settings: bcrypt runs in a bounded thread pool so logins
+# don't block the event loop
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get('PASSWORD_HASH_CONCURRENCY', 4))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_CONCURRENCY, thread_name_prefix="bcrypt")
+
+# Authenticated user cache settings
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', 60))
+USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', 10000))
+
+# Survey definition cache settings
+SURVEY_CACHE_TTL_SECONDS = float(os.environ.get('SURVEY_CACHE_TTL_SECONDS', 300))
+SURVEY_CACHE_MAX_SIZE = int(os.environ.get('SURVEY_CACHE_MAX_SIZE', 1000))
+# Invalidate survey cache entries from a change stream (needs a replica set)
+SURVEY_CACHE_CHANGE_STREAM = os.environ.get('SURVEY_CACHE_CHANGE_STREAM', 'false').lower() == 'true'
+
+# Featured (homepage) payload: rebuilt at most every FEATURED_CACHE_TTL_SECONDS,
+# clients and CDNs may reuse it for FEATURED_MAX_AGE_SECONDS
+FEATURED_CACHE_TTL_SECONDS = float(os.environ.get('FEATURED_CACHE_TTL_SECONDS', 60))
+FEATURED_MAX_AGE_SECONDS = int(os.environ.get('FEATURED_MAX_AGE_SECONDS', 30))
+
+# Live results: votes are pushed to watchers in batches every
+# LIVE_RESULTS_INTERVAL_SECONDS; votes recorded by other workers are picked up
+# by polling every LIVE_RESULTS_POLL_SECONDS
+LIVE_RESULTS_INTERVAL_SECONDS = float(os.environ.get('LIVE_RESULTS_INTERVAL_SECONDS', 1))
+LIVE_RESULTS_POLL_SECONDS = float(os.environ.get('LIVE_RESULTS_POLL_SECONDS', 5))
+LIVE_RESULTS_KEEPALIVE_SECONDS = 15
+
+# Number of responses fetched per round trip when exporting
+EXPORT_BATCH_SIZE = 500
+
+# Background jobs: JOB_WORKERS worker tasks per process (0 to run them elsewhere
+# with `python server.py run-jobs`); cascade deletes pause JOB_BATCH_PAUSE_SECONDS
+# between batches so they don't starve the API of database capacity
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 1))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 5))
+JOB_STALE_SECONDS = float(os.environ.get('JOB_STALE_SECONDS', 3600))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+JOB_DELETE_BATCH_SIZE = int(os.environ.get('JOB_DELETE_BATCH_SIZE', 1000))
+JOB_BATCH_PAUSE_SECONDS = float(os.environ.get('JOB_BATCH_PAUSE_SECONDS', 0.05))
+# Export files are kept for EXPORT_RETENTION_SECONDS; idle job workers delete the
+# expired ones every EXPORT_CLEANUP_INTERVAL_SECONDS
+EXPORT_RETENTION_SECONDS = int(os.environ.get('EXPORT_RETENTION_SECONDS', 86400))
+EXPORT_CLEANUP_INTERVAL_SECONDS = float(os.environ.get('EXPORT_CLEANUP_INTERVAL_SECONDS', 3600))
+
+# Bulk import: documents per insert_many, surveys per request, and how many
+# invalid NDJSON lines are reported back individually
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 500))
+BULK_MAX_SURVEYS = 1000
+BULK_MAX_REPORTED_ERRORS = 100
+
+# Request profiling: owners can run a request under the sampling profiler by
+# sending `X-Profile: 1` or `?profile=1`; captures are kept PROFILE_RETENTION_SECONDS
+PROFILE_INTERVAL_SECONDS = float(os.environ.get('PROFILE_INTERVAL_SECONDS', 0.001))
+PROFILE_RETENTION_SECONDS = int(os.environ.get('PROFILE_RETENTION_SECONDS', 7 * 24 * 3600))
+
+# Pagination settings
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Create the main app. Responses are serialized with orjson; list endpoints declare
+# a response_model so pydantic-core validates and converts them in one pass
+# instead of going through jsonable_encoder.
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
@@ -64,6 +311,23 @@ class User(BaseModel):
     role: str
     created_at: datetime
 
+class UserDetails(User):
+    phone: Optional[str] = ""
+    birth_date: Optional[str] = ""
+    gender: Optional[str] = ""
+    nationality: Optional[str] = ""
+    district: Optional[str] = ""
+    municipality: Optional[str] = ""
+    parish: Optional[str] = ""
+    marital_status: Optional[str] = ""
+    religion: Optional[str] = ""
+    education_level: Optional[str] = ""
+    profession: Optional[str] = ""
+    lived_abroad: Optional[bool] = False
+    abroad_duration: Optional[str] = ""
+    email_notifications: Optional[bool] = False
+    created_at: Optional[datetime] = None
+
 class QuestionModel(BaseModel):
     type: str  # multiple_choice_single, multiple_choice_multiple, text_short, text_long, rating
     text: str
@@ -86,6 +350,17 @@ class Survey(BaseModel):
     end_date: Optional[datetime] = None  # Data limite opcional
     response_count: int = 0
 
+class SurveySummary(BaseModel):
+    id: str
+    title: str
+    description: str
+    created_at: datetime
+    end_date: Optional[datetime] = None
+    is_closed: bool
+    response_count: int = 0
+    has_answered: bool
+    featured: bool = False
+
 class AnswerModel(BaseModel):
     question_index: int
     answer: Any  # Can be string, list of strings, or number
@@ -101,6 +376,11 @@ class Response(BaseModel):
     answers: List[AnswerModel]
     submitted_at: datetime
 
+class MyResponse(BaseModel):
+    survey_id: str
+    survey_title: str
+    submitted_at: datetime
+
 class SuggestionCreate(BaseModel):
     category: Optional[str] = None
     question_type: str
@@ -120,12 +400,103 @@ class Suggestion(BaseModel):
     created_at: datetime
     status: str = "pending"  # pending, reviewed, used
 
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 # Helper functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after `ttl` seconds."""
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0
+        }
+
+# Field projections, so each read only transfers the fields its endpoint uses.
+# List projections must include the field the list is paginated on.
+USER_SESSION_FIELDS = {"password": 0}
+USER_LOGIN_FIELDS = {"email": 1, "password": 1, "name": 1, "role": 1}
+USER_LIST_FIELDS = dict.fromkeys([
+    "email", "name", "role", "phone", "birth_date", "gender", "nationality", "district",
+    "municipality", "parish", "marital_status", "religion", "education_level",
+    "profession", "lived_abroad", "abroad_duration", "email_notifications", "created_at"
+], 1)
+SURVEY_LIST_FIELDS = {
+    "title": 1, "description": 1, "created_at": 1, "end_date": 1, "response_count": 1, "featured": 1
+}
+RESPONSE_LIST_FIELDS = {"survey_id": 1, "user_id": 1, "user_name": 1, "answers": 1, "submitted_at": 1}
+MY_RESPONSE_FIELDS = {"_id": 1, "survey_id": 1, "submitted_at": 1}
+SUGGESTION_LIST_FIELDS = {
+    "user_id": 1, "user_name": 1, "category": 1, "question_type": 1, "question_text": 1,
+    "options": 1, "notes": 1, "created_at": 1, "status": 1
+}
+TEAM_APPLICATION_LIST_FIELDS = {"user_id": 1, "user_name": 1, "user_email": 1, "message": 1, "created_at": 1}
+NEWS_LIST_FIELDS = {"title": 1, "description": 1, "image_url": 1, "featured": 1, "created_at": 1}
+
+# User documents by id, so authenticated requests skip the users lookup. Entries are
+# dropped when the profile changes; role edits made directly in the database are
+# picked up once the entry expires.
+user_cache = TTLCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+# Survey definitions by id. Everything but the counters, which change on every
+# response; `version` is bumped whenever the definition itself changes.
+SURVEY_DEFINITION_FIELDS = {
+    "title": 1, "description": 1, "questions": 1, "created_by": 1,
+    "created_at": 1, "end_date": 1, "featured": 1, "version": 1
+}
+survey_cache = TTLCache(SURVEY_CACHE_MAX_SIZE, SURVEY_CACHE_TTL_SECONDS)
+
+async def hash_password(password: str) -> str:
+    hashed = await asyncio.get_running_loop().run_in_executor(
+        password_executor,
+        lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+    )
+    return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        password_executor,
+        lambda: bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    )
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -141,9 +512,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
         
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
+        user = user_cache.get(user_id)
         if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
+            user = await db.users.find_one({"_id": ObjectId(user_id)}, USER_SESSION_FIELDS)
+            if user is None:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache.set(user_id, user)
+        
+        stats = request_stats.get()
+        if stats is not None:
+            stats.user_role = user.get("role")
         
         return user
     except jwt.ExpiredSignatureError:
@@ -156,18 +534,108 @@ async def get_owner_user(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Only owner can perform this action")
     return current_user
 
+async def get_survey_definition(survey_id: str) -> Optional[dict]:
+    survey = survey_cache.get(survey_id)
+    if survey is None:
+        survey = await db.surveys.find_one({"_id": ObjectId(survey_id)}, SURVEY_DEFINITION_FIELDS)
+        if survey is not None:
+            survey_cache.set(survey_id, survey)
+    return survey
+
+async def watch_survey_changes():
+    """Drop cache entries for surveys changed by other workers."""
+    pipeline = [{"$match": {"operationType": {"$in": ["update", "replace", "delete"]}}}]
+    try:
+        async with db.surveys.watch(pipeline) as stream:
+            async for change in stream:
+                if change["operationType"] == "update":
+                    updated_fields = change["updateDescription"]["updatedFields"]
+                    if set(updated_fields) <= {"response_count"}:
+                        continue
+                survey_cache.invalidate(str(change["documentKey"]["_id"]))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Survey change stream stopped: {e}")
+
+# Conditional GET helpers
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+def make_version_etag(*parts) -> str:
+    """Weak ETag from the values a response depends on, known before building it."""
+    return 'W/' + make_etag(":".join(str(part) for part in parts).encode('utf-8'))
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    strip_weak = lambda tag: tag[2:] if tag.startswith("W/") else tag
+    candidates = [strip_weak(tag.strip()) for tag in if_none_match.split(",")]
+    return "*" in candidates or strip_weak(etag) in candidates
+
+def not_modified(request: Request, response: HTTPResponse, etag: str) -> Optional[HTTPResponse]:
+    """Set the ETag on `response`; return a 304 to send instead if the client has it."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if etag_matches(request, etag):
+        return HTTPResponse(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    return None
+
+def conditional_response(request: Request, body: bytes, etag: str, cache_control: str) -> HTTPResponse:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return HTTPResponse(status_code=304, headers=headers)
+    return HTTPResponse(content=body, media_type="application/json", headers=headers)
+
+# Keyset pagination: pages are ordered by (sort_field, _id) descending and the
+# cursor is an opaque token holding the last item's sort value and id.
+def encode_cursor(sort_value: Optional[datetime], doc_id: ObjectId) -> str:
+    raw = json.dumps([sort_value.isoformat() if sort_value else None, str(doc_id)])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('utf-8')
+
+def decode_cursor(cursor: str):
+    try:
+        sort_value, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode('utf-8')))
+        return (datetime.fromisoformat(sort_value) if sort_value else None), ObjectId(doc_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def paginate(collection, query: dict, sort_field: str, limit: int, cursor: Optional[str] = None, projection: Optional[dict] = None):
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        if sort_value is None:
+            after = {sort_field: None, "_id": {"$lt": last_id}}
+        else:
+            after = {"$or": [
+                {sort_field: {"$lt": sort_value}},
+                {sort_field: sort_value, "_id": {"$lt": last_id}},
+                {sort_field: None}
+            ]}
+        query = {"$and": [query, after]} if query else after
+    
+    # Fetch one extra document to know whether another page exists
+    docs = await collection.find(query, projection).sort([(sort_field, -1), ("_id", -1)]).limit(limit + 1).to_list(limit + 1)
+    
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1].get(sort_field), docs[-1]["_id"])
+    
+    return docs, next_cursor
+
 # Auth endpoints
 @api_router.post("/auth/register")
 async def register(user_data: UserRegister):
     # Check if user exists
-    existing_user = await db.users.find_one({"email": user_data.email})
+    existing_user = await db.users.find_one({"email": user_data.email}, {"_id": 1})
     if existing_user:
         raise HTTPException(status_code=400, detail="Email já registado")
     
     # Create user with all profile fields
     user_dict = {
         "email": user_data.email,
-        "password": hash_password(user_data.password),
+        "password": await hash_password(user_data.password),
         "name": user_data.name,
         "phone": user_data.phone,
         "birth_date": user_data.birth_date,
@@ -206,8 +674,8 @@ async def register(user_data: UserRegister):
 @api_router.post("/auth/login")
 async def login(credentials: UserLogin):
     # Find user
-    user = await db.users.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password"]):
+    user = await db.users.find_one({"email": credentials.email}, USER_LOGIN_FIELDS)
+    if not user or not await verify_password(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Create token
@@ -233,9 +701,9 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     }
 
 # Admin endpoint - Get all users (owner only)
-@api_router.get("/admin/users")
-async def get_all_users(current_user: dict = Depends(get_owner_user)):
-    users = await db.users.find({"role": "user"}).sort("created_at", -1).to_list(1000)
+@api_router.get("/admin/users", response_model=Page[UserDetails])
+async def get_all_users(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_owner_user)):
+    users, next_cursor = await paginate(db.users, {"role": "user"}, "created_at", limit, cursor, USER_LIST_FIELDS)
     
     result = []
     for user in users:
@@ -243,6 +711,7 @@ async def get_all_users(current_user: dict = Depends(get_owner_user)):
             "id": str(user["_id"]),
             "email": user["email"],
             "name": user.get("name", ""),
+            "role": user.get("role", "user"),
             "phone": user.get("phone", ""),
             "birth_date": user.get("birth_date", ""),
             "gender": user.get("gender", ""),
@@ -257,13 +726,18 @@ async def get_all_users(current_user: dict = Depends(get_owner_user)):
             "lived_abroad": user.get("lived_abroad", False),
             "abroad_duration": user.get("abroad_duration", ""),
             "email_notifications": user.get("email_notifications", False),
-            "created_at": user.get("created_at", "")
+            "created_at": user.get("created_at")
         })
     
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 @api_router.get("/profile")
-async def get_profile(current_user: dict = Depends(get_current_user)):
+async def get_profile(request: Request, response: HTTPResponse, current_user: dict = Depends(get_current_user)):
+    etag = make_version_etag(current_user["_id"], current_user.get("updated_at") or current_user.get("created_at"))
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    
     return {
         "id": str(current_user["_id"]),
         "email": current_user["email"],
@@ -303,16 +777,26 @@ async def update_profile(profile_data: ProfileUpdate, current_user: dict = Depen
     update_dict = {k: v for k, v in profile_data.dict().items() if v is not None}
     
     if update_dict:
+        update_dict["updated_at"] = datetime.utcnow()
         await db.users.update_one(
             {"_id": current_user["_id"]},
             {"$set": update_dict}
         )
+        user_cache.invalidate(str(current_user["_id"]))
     
     return {"message": "Perfil atualizado com sucesso"}
 
 class TeamApplication(BaseModel):
     message: str
 
+class TeamApplicationItem(BaseModel):
+    id: str
+    user_id: Optional[str] = None
+    user_name: Optional[str] = None
+    user_email: Optional[str] = None
+    message: Optional[str] = None
+    created_at: Optional[datetime] = None
+
 @api_router.post("/team-application")
 async def submit_team_application(application: TeamApplication, current_user: dict = Depends(get_current_user)):
     application_dict = {
@@ -329,17 +813,21 @@ async def submit_team_application(application: TeamApplication, current_user: di
     return {"message": "Candidatura enviada com sucesso"}
 
 # Survey endpoints
-@api_router.post("/surveys")
-async def create_survey(survey_data: SurveyCreate, current_user: dict = Depends(get_owner_user)):
-    survey_dict = {
+def build_survey_document(survey_data: SurveyCreate, user: dict) -> dict:
+    return {
         "title": survey_data.title,
         "description": survey_data.description,
         "questions": [q.dict() for q in survey_data.questions],
-        "created_by": str(current_user["_id"]),
+        "created_by": str(user["_id"]),
         "created_at": datetime.utcnow(),
         "response_count": 0,
-        "end_date": datetime.strptime(survey_data.end_date, "%Y-%m-%d") if survey_data.end_date else None
+        "end_date": datetime.strptime(survey_data.end_date, "%Y-%m-%d") if survey_data.end_date else None,
+        "version": 1
     }
+
+@api_router.post("/surveys")
+async def create_survey(survey_data: SurveyCreate, current_user: dict = Depends(get_owner_user)):
+    survey_dict = build_survey_document(survey_data, current_user)
     
     result = await db.surveys.insert_one(survey_dict)
     survey_dict["_id"] = result.inserted_id
@@ -355,18 +843,18 @@ async def create_survey(survey_data: SurveyCreate, current_user: dict = Depends(
         "response_count": 0
     }
 
-@api_router.get("/surveys")
-async def get_surveys(current_user: dict = Depends(get_current_user)):
-    surveys = await db.surveys.find().sort("created_at", -1).to_list(1000)
-    
+@api_router.get("/surveys", response_model=Page[SurveySummary])
+async def get_surveys(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    surveys, next_cursor = await paginate(db.surveys, {}, "created_at", limit, cursor, SURVEY_LIST_FIELDS)
+
+    # Resolve which of these surveys the current user has answered in a single query
+    answered_ids = set(await db.responses.distinct("survey_id", {
+        "user_id": str(current_user["_id"]),
+        "survey_id": {"$in": [str(survey["_id"]) for survey in surveys]}
+    }))
+
     result = []
     for survey in surveys:
-        # Check if current user has answered
-        has_answered = await db.responses.find_one({
-            "survey_id": str(survey["_id"]),
-            "user_id": str(current_user["_id"])
-        })
-        
         # Check if survey is closed (end_date passed)
         end_date = survey.get("end_date")
         is_closed = end_date is not None and datetime.utcnow() > end_date
@@ -379,24 +867,33 @@ async def get_surveys(current_user: dict = Depends(get_current_user)):
             "end_date": end_date,
             "is_closed": is_closed,
             "response_count": survey.get("response_count", 0),
-            "has_answered": has_answered is not None,
+            "has_answered": str(survey["_id"]) in answered_ids,
             "featured": survey.get("featured", False)
         })
     
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 @api_router.get("/surveys/{survey_id}")
-async def get_survey(survey_id: str, current_user: dict = Depends(get_current_user)):
+async def get_survey(survey_id: str, request: Request, response: HTTPResponse, current_user: dict = Depends(get_current_user)):
     try:
-        survey = await db.surveys.find_one({"_id": ObjectId(survey_id)})
+        survey = await get_survey_definition(survey_id)
         if not survey:
             raise HTTPException(status_code=404, detail="Survey not found")
         
-        # Check if user has answered
-        has_answered = await db.responses.find_one({
-            "survey_id": survey_id,
-            "user_id": str(current_user["_id"])
-        })
+        # Check if user has answered, and read the live response count alongside
+        has_answered, counters = await asyncio.gather(
+            db.responses.find_one({
+                "survey_id": survey_id,
+                "user_id": str(current_user["_id"])
+            }, {"_id": 1}),
+            db.surveys.find_one({"_id": survey["_id"]}, {"response_count": 1})
+        )
+        response_count = (counters or {}).get("response_count", 0)
+        
+        etag = make_version_etag(survey_id, survey.get("version"), response_count, has_answered is not None)
+        cached = not_modified(request, response, etag)
+        if cached:
+            return cached
         
         return {
             "id": str(survey["_id"]),
@@ -404,9 +901,11 @@ async def get_survey(survey_id: str, current_user: dict = Depends(get_current_us
             "description": survey["description"],
             "questions": survey["questions"],
             "created_at": survey["created_at"],
-            "response_count": survey.get("response_count", 0),
+            "response_count": response_count,
             "has_answered": has_answered is not None
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -414,27 +913,214 @@ async def get_survey(survey_id: str, current_user: dict = Depends(get_current_us
 async def delete_survey(survey_id: str, current_user: dict = Depends(get_owner_user)):
     try:
         # Check if survey exists
-        survey = await db.surveys.find_one({"_id": ObjectId(survey_id)})
+        survey = await get_survey_definition(survey_id)
         if not survey:
             raise HTTPException(status_code=404, detail="Survey not found")
         
-        # Delete all responses for this survey
-        await db.responses.delete_many({"survey_id": survey_id})
-        
-        # Delete the survey
+        # Delete the survey; its responses and results are removed by a background job
         await db.surveys.delete_one({"_id": ObjectId(survey_id)})
+        survey_cache.invalidate(survey_id)
+        if survey.get("featured"):
+            invalidate_featured_cache()
+        
+        job_id = await enqueue_job("delete_survey_data", {"survey_id": survey_id}, current_user)
         
-        return {"message": "Survey deleted successfully"}
+        return {"message": "Survey deleted successfully", "job_id": job_id}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# Survey results are kept pre-aggregated in db.survey_results (one document per
+# survey, _id = survey_id) and updated with $inc on every submitted response:
+#   {"total_responses": n, "questions": {"<idx>": {"options": {"<option idx>": n},
+#    "rating_sum": x, "rating_count": n, "distribution": {"<rating>": n}, "count": n}}}
+# Options are keyed by their position and ratings by an encoded value because
+# option texts and decimal ratings may contain "." which is not allowed in field paths.
+def is_valid_rating(question: dict, value) -> bool:
+    """Finite numbers (not booleans) between 1 and the question's max_rating."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return False
+    return 1 <= value <= (question.get("max_rating") or 5)
+
+def encode_rating_key(rating) -> str:
+    return str(rating).replace('.', '_')
+
+def decode_rating_key(key: str):
+    # Floats are written as "4_5" or, when large, in exponent form ("1e+16")
+    return float(key.replace('_', '.')) if '_' in key or 'e' in key else int(key)
+
+def build_results_increments(questions: list, answers: list) -> dict:
+    increments = {"total_responses": 1}
+    
+    def inc(path, amount=1):
+        increments[path] = increments.get(path, 0) + amount
+    
+    for answer in answers:
+        idx = answer["question_index"]
+        if not 0 <= idx < len(questions):
+            continue
+        question = questions[idx]
+        value = answer["answer"]
+        prefix = f"questions.{idx}"
+        
+        if question["type"] in ["multiple_choice_single", "multiple_choice_multiple"]:
+            options = question.get("options") or []
+            if question["type"] == "multiple_choice_single":
+                chosen = [value]
+            else:
+                chosen = value if isinstance(value, list) else []
+            for option in chosen:
+                if option in options:
+                    inc(f"{prefix}.options.{options.index(option)}")
+        
+        elif question["type"] == "rating":
+            if is_valid_rating(question, value):
+                inc(f"{prefix}.rating_sum", value)
+                inc(f"{prefix}.rating_count")
+                inc(f"{prefix}.distribution.{encode_rating_key(value)}")
+        
+        else:  # text questions
+            inc(f"{prefix}.count")
+    
+    return increments
+
+def expand_results_increments(totals: dict) -> dict:
+    """Turn dotted survey_results paths into the nested document layout."""
+    aggregates = {"questions": {}}
+    for path, amount in totals.items():
+        node = aggregates
+        *parents, leaf = path.split('.')
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = amount
+    return aggregates
+
+def format_question_results(question: dict, stats: dict, text_answers: Optional[list] = None) -> dict:
+    if question["type"] in ["multiple_choice_single", "multiple_choice_multiple"]:
+        option_counts = stats.get("options", {})
+        return {
+            opt: option_counts.get(str(question["options"].index(opt)), 0)
+            for opt in question.get("options") or []
+        }
+    
+    elif question["type"] == "rating":
+        rating_count = stats.get("rating_count", 0)
+        distribution = {}
+        for key, count in stats.get("distribution", {}).items():
+            try:
+                distribution[decode_rating_key(key)] = count
+            except ValueError:
+                # Counted before ratings were validated; `rebuild-results` removes it
+                continue
+        return {
+            "average": stats.get("rating_sum", 0) / rating_count if rating_count else 0,
+            "distribution": distribution
+        }
+    
+    else:  # text questions
+        return {
+            "count": stats.get("count", 0),
+            "responses": text_answers or []  # Only owner sees actual text
+        }
+
+def format_survey_results(survey: dict, aggregates: Optional[dict], text_answers: Optional[dict] = None) -> list:
+    questions_aggregates = (aggregates or {}).get("questions", {})
+    
+    return [{
+        "question_index": idx,
+        "question_text": question["text"],
+        "question_type": question["type"],
+        "results": format_question_results(question, questions_aggregates.get(str(idx), {}), (text_answers or {}).get(idx))
+    } for idx, question in enumerate(survey["questions"])]
+
+def get_text_question_indexes(survey: dict) -> list:
+    return [
+        idx for idx, question in enumerate(survey["questions"])
+        if question["type"] not in ["multiple_choice_single", "multiple_choice_multiple", "rating"]
+    ]
+
+async def compute_survey_results(survey: dict) -> dict:
+    """Tally a survey's responses into a survey_results document (not written)."""
+    survey_id = str(survey["_id"])
+    
+    # Tally (question, answer) pairs server-side so only the distinct answers per
+    # question come back, not every response. Text answers are only counted.
+    pipeline = [
+        {"$match": {"survey_id": survey_id}},
+        {"$facet": {
+            "total": [{"$count": "responses"}],
+            "tallies": [
+                {"$unwind": "$answers"},
+                {"$group": {
+                    "_id": {
+                        "question_index": "$answers.question_index",
+                        "answer": {"$cond": [
+                            {"$in": ["$answers.question_index", get_text_question_indexes(survey)]},
+                            None,
+                            "$answers.answer"
+                        ]}
+                    },
+                    "count": {"$sum": 1}
+                }}
+            ]
+        }}
+    ]
+    facets = (await db.responses.aggregate(pipeline).to_list(1))[0]
+    
+    totals = {"total_responses": facets["total"][0]["responses"] if facets["total"] else 0}
+    for tally in facets["tallies"]:
+        increments = build_results_increments(survey["questions"], [tally["_id"]])
+        del increments["total_responses"]
+        for path, amount in increments.items():
+            totals[path] = totals.get(path, 0) + amount * tally["count"]
+    
+    return {"_id": survey_id, "rebuilt_at": datetime.utcnow(), **expand_results_increments(totals)}
+
+async def rebuild_survey_results(survey: dict) -> dict:
+    """Recompute the survey_results document for a survey from db.responses.
+    
+    Not atomic with votes: a $inc that lands between the aggregation and the replace
+    is lost, and so is a response_count bump. Run it (the rebuild job, or the
+    rebuild-results command) while the survey isn't taking votes.
+    """
+    aggregates = await compute_survey_results(survey)
+    await db.survey_results.replace_one({"_id": aggregates["_id"]}, aggregates, upsert=True)
+    
+    # Repair the response counter too
+    await db.surveys.update_one(
+        {"_id": survey["_id"]},
+        {"$set": {"response_count": aggregates["total_responses"]}}
+    )
+    return aggregates
+
+async def rebuild_missing_survey_results() -> int:
+    """Rebuild results for answered surveys that have no survey_results document.
+
+    Runs at startup, before this worker takes votes: submit_response and the import
+    only $inc survey_results, so a survey answered before results were pre-aggregated
+    would otherwise count from its next vote on.
+    """
+    answered = set(await db.responses.distinct("survey_id"))
+    missing = answered - set(await db.survey_results.distinct("_id"))
+    survey_ids = [ObjectId(survey_id) for survey_id in missing if ObjectId.is_valid(survey_id)]
+    rebuilt = 0
+    async for survey in db.surveys.find({"_id": {"$in": survey_ids}}, SURVEY_DEFINITION_FIELDS):
+        try:
+            # Only create the document: other workers may already be $inc'ing it
+            await db.survey_results.insert_one(await compute_survey_results(survey))
+        except DuplicateKeyError:
+            # A vote created it meanwhile and wasn't necessarily in the tally; it is
+            # stored by now, so count again
+            await rebuild_survey_results(survey)
+        rebuilt += 1
+    return rebuilt
+
 @api_router.post("/surveys/{survey_id}/respond")
 async def submit_response(survey_id: str, response_data: ResponseCreate, current_user: dict = Depends(get_current_user)):
     try:
         # Check if survey exists
-        survey = await db.surveys.find_one({"_id": ObjectId(survey_id)})
+        survey = await get_survey_definition(survey_id)
         if not survey:
             raise HTTPException(status_code=404, detail="Survey not found")
         
@@ -443,30 +1129,47 @@ async def submit_response(survey_id: str, response_data: ResponseCreate, current
         if end_date and datetime.utcnow() > end_date:
             raise HTTPException(status_code=400, detail="Esta sondagem já está encerrada")
         
-        # Check if user already answered
-        existing_response = await db.responses.find_one({
-            "survey_id": survey_id,
-            "user_id": str(current_user["_id"])
-        })
-        if existing_response:
-            raise HTTPException(status_code=400, detail="You have already answered this survey")
-        
-        # Create response
+        # Create response. The unique {survey_id, user_id} index rejects a second
+        # answer, so concurrent submits from the same user can't both land. The API
+        # doesn't start without it (REQUIRED_INDEXES).
         response_dict = {
             "survey_id": survey_id,
             "user_id": str(current_user["_id"]),
             "user_name": current_user["name"],
             "answers": [a.dict() for a in response_data.answers],
+            "respondent": build_respondent_snapshot(current_user),
             "submitted_at": datetime.utcnow()
         }
         
-        await db.responses.insert_one(response_dict)
+        try:
+            await db.responses.insert_one(response_dict)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail="You have already answered this survey")
         
-        # Update response count
-        await db.surveys.update_one(
-            {"_id": ObjectId(survey_id)},
-            {"$inc": {"response_count": 1}}
+        # Only the request whose insert succeeded bumps the response count and the
+        # pre-aggregated results; both writes go out together
+        counted, _ = await asyncio.gather(
+            db.surveys.update_one(
+                {"_id": ObjectId(survey_id)},
+                {"$inc": {"response_count": 1}}
+            ),
+            db.survey_results.update_one(
+                {"_id": survey_id},
+                {"$inc": build_results_increments(survey["questions"], response_dict["answers"])},
+                upsert=True
+            )
         )
+        if counted.matched_count == 0:
+            # Deleted since this worker cached it: undo both writes so nothing is left
+            # behind the cascade delete
+            await asyncio.gather(
+                db.responses.delete_one({"_id": response_dict["_id"]}),
+                db.survey_results.delete_one({"_id": survey_id})
+            )
+            survey_cache.invalidate(survey_id)
+            raise HTTPException(status_code=404, detail="Survey not found")
+        
+        notify_live_results(survey_id)
         
         return {"message": "Response submitted successfully"}
     except HTTPException:
@@ -475,130 +1178,509 @@ async def submit_response(survey_id: str, response_data: ResponseCreate, current
         raise HTTPException(status_code=400, detail=str(e))
 
 @api_router.get("/surveys/{survey_id}/results")
-async def get_survey_results(survey_id: str, current_user: dict = Depends(get_current_user)):
+async def get_survey_results(survey_id: str, request: Request, response: HTTPResponse, current_user: dict = Depends(get_current_user)):
     try:
         # Check if survey exists
-        survey = await db.surveys.find_one({"_id": ObjectId(survey_id)})
+        survey = await get_survey_definition(survey_id)
         if not survey:
             raise HTTPException(status_code=404, detail="Survey not found")
         
         # Check if user has answered (only users who answered can see results)
-        has_answered = await db.responses.find_one({
-            "survey_id": survey_id,
-            "user_id": str(current_user["_id"])
-        })
+        has_answered, aggregates = await asyncio.gather(
+            db.responses.find_one({
+                "survey_id": survey_id,
+                "user_id": str(current_user["_id"])
+            }, {"_id": 1}),
+            db.survey_results.find_one({"_id": survey_id})
+        )
         
         is_owner = current_user.get("role") == "owner"
         
         if not has_answered and not is_owner:
             raise HTTPException(status_code=403, detail="You must answer the survey to see results")
         
-        # Get all responses
-        responses = await db.responses.find({"survey_id": survey_id}).to_list(1000)
-        
-        # Aggregate results
-        aggregated = []
-        for idx, question in enumerate(survey["questions"]):
-            question_results = {
-                "question_index": idx,
-                "question_text": question["text"],
-                "question_type": question["type"],
-                "results": {}
-            }
-            
-            if question["type"] in ["multiple_choice_single", "multiple_choice_multiple"]:
-                # Count votes for each option
-                option_counts = {opt: 0 for opt in question.get("options", [])}
-                for response in responses:
-                    for answer in response["answers"]:
-                        if answer["question_index"] == idx:
-                            if question["type"] == "multiple_choice_single":
-                                option = answer["answer"]
-                                if option in option_counts:
-                                    option_counts[option] += 1
-                            else:  # multiple
-                                for option in answer["answer"]:
-                                    if option in option_counts:
-                                        option_counts[option] += 1
-                question_results["results"] = option_counts
-            
-            elif question["type"] == "rating":
-                # Calculate average rating
-                ratings = []
-                rating_counts = {}
-                for response in responses:
-                    for answer in response["answers"]:
-                        if answer["question_index"] == idx:
-                            rating = answer["answer"]
-                            # Ensure rating is a number, not a list
-                            if isinstance(rating, (int, float)):
-                                ratings.append(rating)
-                                rating_counts[rating] = rating_counts.get(rating, 0) + 1
-                
-                question_results["results"] = {
-                    "average": sum(ratings) / len(ratings) if ratings else 0,
-                    "distribution": rating_counts
-                }
-            
-            else:  # text questions
-                # Just count responses
-                text_responses = []
-                for response in responses:
-                    for answer in response["answers"]:
-                        if answer["question_index"] == idx:
-                            text_responses.append(answer["answer"])
-                question_results["results"] = {
-                    "count": len(text_responses),
-                    "responses": text_responses if is_owner else []  # Only owner sees actual text
-                }
+        # No document yet means no votes: older surveys are rebuilt at startup, not
+        # here, as a rebuild would race the votes coming in
+        aggregates = aggregates or {}
+        
+        etag = make_version_etag(
+            survey_id, survey.get("version"), aggregates.get("total_responses"), aggregates.get("rebuilt_at"), is_owner
+        )
+        cached = not_modified(request, response, etag)
+        if cached:
+            return cached
+        
+        # Text answers are not aggregated, the owner reads them from the responses
+        text_answers = {}
+        text_indexes = get_text_question_indexes(survey)
+        if is_owner and text_indexes:
+            pipeline = [
+                {"$match": {"survey_id": survey_id}},
+                {"$unwind": "$answers"},
+                {"$match": {"answers.question_index": {"$in": text_indexes}}},
+                {"$project": {"_id": 0, "question_index": "$answers.question_index", "answer": "$answers.answer"}}
+            ]
+            async for answer in db.responses.aggregate(pipeline):
+                text_answers.setdefault(answer["question_index"], []).append(answer["answer"])
+        
+        return {
+            "survey_id": survey_id,
+            "title": survey["title"],
+            "total_responses": aggregates.get("total_responses", 0),
+            "aggregated_results": format_survey_results(survey, aggregates, text_answers)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Recompute results from the responses (owner only). Votes that land while it runs
+# may be lost, see rebuild_survey_results
+@api_router.post("/surveys/{survey_id}/results/rebuild", status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_results(survey_id: str, current_user: dict = Depends(get_owner_user)):
+    try:
+        survey = await get_survey_definition(survey_id)
+        if not survey:
+            raise HTTPException(status_code=404, detail="Survey not found")
+        
+        job_id = await enqueue_job("rebuild_results", {"survey_id": survey_id}, current_user)
+        
+        return {"message": "Recálculo dos resultados agendado", "job_id": job_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ===========================================
+# Live results (Server-Sent Events)
+# ===========================================
+
+class LiveResultsChannel:
+    """Watchers of one survey's results, fed by a single ticker task."""
+    
+    def __init__(self, survey: dict):
+        self.survey = survey
+        self.subscribers = set()
+        self.changed = asyncio.Event()
+        self.total_responses = None
+        self.results = None
+        self.task = None
+    
+    async def refresh(self) -> Optional[dict]:
+        """Re-read the aggregates; return a delta event if anything changed."""
+        aggregates = await db.survey_results.find_one(
+            {"_id": str(self.survey["_id"])}, {"total_responses": 1, "questions": 1}
+        ) or {}
+        results = format_survey_results(self.survey, aggregates)
+        previous = self.results or []
+        changed = [question for idx, question in enumerate(results) if idx >= len(previous) or previous[idx] != question]
+        
+        self.total_responses = aggregates.get("total_responses", 0)
+        self.results = results
+        if not changed:
+            return None
+        return {"event": "delta", "total_responses": self.total_responses, "aggregated_results": changed}
+    
+    def snapshot(self) -> dict:
+        return {"event": "snapshot", "total_responses": self.total_responses, "aggregated_results": self.results}
+    
+    def publish(self, event: dict):
+        for queue in self.subscribers:
+            if queue.full():
+                # Slow client: drop its backlog and resync it with a full snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.snapshot())
+            else:
+                queue.put_nowait(event)
+    
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.changed.wait(), timeout=LIVE_RESULTS_POLL_SECONDS)
+                # Let the rest of this interval's votes arrive, then send them as one update
+                await asyncio.sleep(LIVE_RESULTS_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.changed.clear()
+            try:
+                event = await self.refresh()
+            except Exception as e:
+                logger.error(f"Live results refresh failed for survey {self.survey['_id']}: {e}")
+                continue
+            if event:
+                self.publish(event)
+
+live_results_channels: Dict[str, LiveResultsChannel] = {}
+
+def notify_live_results(survey_id: str):
+    channel = live_results_channels.get(survey_id)
+    if channel:
+        channel.changed.set()
+
+async def subscribe_live_results(survey: dict) -> asyncio.Queue:
+    survey_id = str(survey["_id"])
+    if survey_id not in live_results_channels:
+        # Registered only once it has results and a ticker, so a failed first refresh
+        # leaves nothing behind and nobody is handed an empty snapshot
+        channel = LiveResultsChannel(survey)
+        await channel.refresh()
+        # Another subscriber may have registered one while this refresh ran
+        if survey_id not in live_results_channels:
+            live_results_channels[survey_id] = channel
+            # Not in this request's context: the ticker outlives it, and its refreshes
+            # must not be recorded in the first subscriber's request stats
+            channel.task = asyncio.create_task(channel.run(), context=contextvars.Context())
+    channel = live_results_channels[survey_id]
+    
+    queue = asyncio.Queue(maxsize=10)
+    queue.put_nowait(channel.snapshot())
+    channel.subscribers.add(queue)
+    return queue
+
+def unsubscribe_live_results(survey_id: str, queue: asyncio.Queue):
+    channel = live_results_channels.get(survey_id)
+    if channel is None:
+        return
+    channel.subscribers.discard(queue)
+    if not channel.subscribers:
+        if channel.task:
+            channel.task.cancel()
+        del live_results_channels[survey_id]
+
+@api_router.get("/surveys/{survey_id}/results/stream")
+async def stream_survey_results(survey_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    try:
+        survey = await get_survey_definition(survey_id)
+        if not survey:
+            raise HTTPException(status_code=404, detail="Survey not found")
+        
+        # Same rule as the results endpoint
+        has_answered = await db.responses.find_one({
+            "survey_id": survey_id,
+            "user_id": str(current_user["_id"])
+        }, {"_id": 1})
+        if not has_answered and current_user.get("role") != "owner":
+            raise HTTPException(status_code=403, detail="You must answer the survey to see results")
+        
+        queue = await subscribe_live_results(survey)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=LIVE_RESULTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                # Events are shared between subscribers, so copy before dropping the type
+                data = {key: value for key, value in event.items() if key != "event"}
+                yield f"event: {event['event']}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+        finally:
+            unsubscribe_live_results(survey_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ===========================================
+# Demographic cross-tabulation
+# ===========================================
+
+# Respondent profile fields results can be broken down by; age_band is derived from birth_date
+CROSSTAB_DIMENSIONS = [
+    "gender", "age_band", "district", "municipality", "nationality",
+    "education_level", "marital_status", "religion", "lived_abroad"
+]
+RESPONDENT_SNAPSHOT_FIELDS = {dimension: 1 for dimension in CROSSTAB_DIMENSIONS if dimension != "age_band"}
+RESPONDENT_SNAPSHOT_FIELDS["birth_date"] = 1
+UNKNOWN_SEGMENT = "Desconhecido"
+AGE_BANDS = [(18, "<18"), (25, "18-24"), (35, "25-34"), (45, "35-44"), (55, "45-54"), (65, "55-64")]
+
+def get_age_band(birth_date: Optional[str]) -> str:
+    # birth_date is free text, entered as DD/MM/AAAA in the app
+    for date_format in ("%d/%m/%Y", "%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            born = datetime.strptime((birth_date or "").strip(), date_format)
+            break
+        except ValueError:
+            continue
+    else:
+        return UNKNOWN_SEGMENT
+    
+    today = datetime.utcnow()
+    age = today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+    if age < 0:
+        return UNKNOWN_SEGMENT
+    for upper, label in AGE_BANDS:
+        if age < upper:
+            return label
+    return "65+"
+
+def build_respondent_snapshot(user: dict) -> dict:
+    """Demographic fields copied onto each response so cross-tabs read a single collection."""
+    snapshot = {dimension: user.get(dimension) for dimension in CROSSTAB_DIMENSIONS if dimension != "age_band"}
+    snapshot["age_band"] = get_age_band(user.get("birth_date"))
+    return snapshot
+
+async def backfill_respondent_snapshots() -> int:
+    """Add the respondent snapshot to responses submitted before it existed.
+    
+    Uses each respondent's current profile, as the profile at answer time is not known.
+    """
+    updated = 0
+    user_ids = await db.responses.distinct("user_id", {"respondent": {"$exists": False}})
+    for start in range(0, len(user_ids), EXPORT_BATCH_SIZE):
+        # Imported responses may carry ids that aren't accounts
+        batch = [ObjectId(user_id) for user_id in user_ids[start:start + EXPORT_BATCH_SIZE] if ObjectId.is_valid(user_id)]
+        users = await db.users.find({"_id": {"$in": batch}}, RESPONDENT_SNAPSHOT_FIELDS).to_list(None)
+        if not users:
+            continue
+        result = await db.responses.bulk_write([
+            UpdateMany(
+                {"user_id": str(user["_id"]), "respondent": {"$exists": False}},
+                {"$set": {"respondent": build_respondent_snapshot(user)}}
+            )
+            for user in users
+        ], ordered=False)
+        updated += result.modified_count
+    return updated
+
+def format_segment_value(dimension: str, value) -> str:
+    if isinstance(value, bool):
+        return "Sim" if value else "Não"
+    return value if value not in (None, "") else UNKNOWN_SEGMENT
+
+@api_router.get("/surveys/{survey_id}/crosstab")
+async def get_survey_crosstab(
+    survey_id: str,
+    question_index: int = Query(..., ge=0),
+    dimensions: str = Query(..., description="One or two comma separated profile fields"),
+    current_user: dict = Depends(get_owner_user)
+):
+    try:
+        survey = await get_survey_definition(survey_id)
+        if not survey:
+            raise HTTPException(status_code=404, detail="Survey not found")
+        if question_index >= len(survey["questions"]):
+            raise HTTPException(status_code=400, detail="Invalid question index")
+        
+        dimension_list = [d.strip() for d in dimensions.split(",") if d.strip()]
+        if not 1 <= len(dimension_list) <= 2 or any(d not in CROSSTAB_DIMENSIONS for d in dimension_list):
+            raise HTTPException(
+                status_code=400,
+                detail=f"dimensions must be one or two of: {', '.join(CROSSTAB_DIMENSIONS)}"
+            )
+        
+        question = survey["questions"][question_index]
+        is_text = question_index in get_text_question_indexes(survey)
+        
+        # Tally per (answer, segment) using the respondent snapshot stored on each response
+        pipeline = [
+            {"$match": {"survey_id": survey_id}},
+            {"$project": {"answers": 1, "respondent": 1}},
+            {"$unwind": "$answers"},
+            {"$match": {"answers.question_index": question_index}},
+            {"$group": {
+                "_id": {
+                    "answer": None if is_text else "$answers.answer",
+                    "segment": {dimension: f"$respondent.{dimension}" for dimension in dimension_list}
+                },
+                "count": {"$sum": 1}
+            }}
+        ]
+        
+        segments = {}
+        async for tally in db.responses.aggregate(pipeline):
+            key = tuple(
+                format_segment_value(dimension, tally["_id"]["segment"].get(dimension))
+                for dimension in dimension_list
+            )
+            segment = segments.setdefault(key, {"total_responses": 0})
+            segment["total_responses"] += tally["count"]
             
-            aggregated.append(question_results)
+            increments = build_results_increments(
+                survey["questions"],
+                [{"question_index": question_index, "answer": tally["_id"]["answer"]}]
+            )
+            del increments["total_responses"]
+            for path, amount in increments.items():
+                segment[path] = segment.get(path, 0) + amount * tally["count"]
+        
+        result = []
+        for key in sorted(segments):
+            totals = segments[key]
+            total_responses = totals.pop("total_responses")
+            stats = expand_results_increments(totals)["questions"].get(str(question_index), {})
+            result.append({
+                "segment": dict(zip(dimension_list, key)),
+                "total_responses": total_responses,
+                "results": format_question_results(question, stats)
+            })
         
         return {
             "survey_id": survey_id,
             "title": survey["title"],
-            "total_responses": len(responses),
-            "aggregated_results": aggregated
+            "question_index": question_index,
+            "question_text": question["text"],
+            "question_type": question["type"],
+            "dimensions": dimension_list,
+            "segments": result
         }
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@api_router.get("/surveys/{survey_id}/responses")
-async def get_all_responses(survey_id: str, current_user: dict = Depends(get_owner_user)):
+# Backfill respondent demographics on older responses (owner only)
+@api_router.post("/admin/backfill-demographics")
+async def backfill_demographics(current_user: dict = Depends(get_owner_user)):
+    updated = await backfill_respondent_snapshots()
+    return {"message": "Dados demográficos atualizados", "updated_responses": updated}
+
+@api_router.get("/surveys/{survey_id}/responses", response_model=Page[Response])
+async def get_all_responses(survey_id: str, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_owner_user)):
     try:
-        responses = await db.responses.find({"survey_id": survey_id}).sort("submitted_at", -1).to_list(1000)
+        responses, next_cursor = await paginate(db.responses, {"survey_id": survey_id}, "submitted_at", limit, cursor, RESPONSE_LIST_FIELDS)
         
         result = []
         for response in responses:
             result.append({
                 "id": str(response["_id"]),
+                "survey_id": response["survey_id"],
+                "user_id": response["user_id"],
                 "user_name": response["user_name"],
                 "answers": response["answers"],
                 "submitted_at": response["submitted_at"]
             })
         
-        return result
+        return {"items": result, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@api_router.get("/my-responses")
-async def get_my_responses(current_user: dict = Depends(get_current_user)):
-    responses = await db.responses.find({"user_id": str(current_user["_id"])}).sort("submitted_at", -1).to_list(1000)
+def format_export_answer(answer):
+    if isinstance(answer, list):
+        return "; ".join(str(item) for item in answer)
+    return answer
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+async def iter_export_chunks(survey: dict, export_format: str):
+    """Yield a survey's responses as CSV or NDJSON text, EXPORT_BATCH_SIZE rows per chunk.
+    
+    Rows are streamed straight from the cursor, so memory use doesn't grow with
+    the number of responses.
+    """
+    # One column per question
+    question_columns = [f"{idx + 1}. {question['text']}" for idx, question in enumerate(survey["questions"])]
+    
+    def to_row(response: dict) -> dict:
+        row = {
+            "id": str(response["_id"]),
+            "user_name": response.get("user_name", ""),
+            "submitted_at": response["submitted_at"].isoformat()
+        }
+        row.update({column: None for column in question_columns})
+        for answer in response["answers"]:
+            if 0 <= answer["question_index"] < len(question_columns):
+                row[question_columns[answer["question_index"]]] = answer["answer"]
+        return row
+    
+    cursor = db.responses.find(
+        {"survey_id": str(survey["_id"])},
+        {"user_name": 1, "answers": 1, "submitted_at": 1}
+    ).sort("submitted_at", 1).batch_size(EXPORT_BATCH_SIZE)
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(["id", "user_name", "submitted_at"] + question_columns)
+    
+    rows = 0
+    async for response in cursor:
+        row = to_row(response)
+        if export_format == "csv":
+            writer.writerow([format_export_answer(value) for value in row.values()])
+        else:
+            buffer.write(orjson.dumps(row).decode('utf-8') + "\n")
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+@api_router.get("/surveys/{survey_id}/responses/export")
+async def export_responses(
+    survey_id: str,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    current_user: dict = Depends(get_owner_user)
+):
+    try:
+        survey = await get_survey_definition(survey_id)
+        if not survey:
+            raise HTTPException(status_code=404, detail="Survey not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        iter_export_chunks(survey, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="survey-{survey_id}.{export_format}"'}
+    )
+
+# Export to a file in the background, downloadable from /jobs/{job_id}/download (owner only)
+@api_router.post("/surveys/{survey_id}/responses/export-jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    survey_id: str,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    current_user: dict = Depends(get_owner_user)
+):
+    try:
+        survey = await get_survey_definition(survey_id)
+        if not survey:
+            raise HTTPException(status_code=404, detail="Survey not found")
+        
+        job_id = await enqueue_job("export_responses", {"survey_id": survey_id, "format": export_format}, current_user)
+        
+        return {"message": "Exportação agendada", "job_id": job_id}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@api_router.get("/my-responses", response_model=Page[MyResponse])
+async def get_my_responses(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    responses, next_cursor = await paginate(db.responses, {"user_id": str(current_user["_id"])}, "submitted_at", limit, cursor, MY_RESPONSE_FIELDS)
+    
+    # Resolve every survey title on the page in one query
+    survey_ids = list({ObjectId(response["survey_id"]) for response in responses})
+    titles = {
+        str(survey["_id"]): survey["title"]
+        async for survey in db.surveys.find({"_id": {"$in": survey_ids}}, {"title": 1})
+    } if survey_ids else {}
     
     result = []
     for response in responses:
-        # Get survey info
-        survey = await db.surveys.find_one({"_id": ObjectId(response["survey_id"])})
-        if survey:
+        if response["survey_id"] in titles:
             result.append({
                 "survey_id": response["survey_id"],
-                "survey_title": survey["title"],
+                "survey_title": titles[response["survey_id"]],
                 "submitted_at": response["submitted_at"]
             })
     
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 # Suggestion endpoints
 @api_router.post("/suggestions")
@@ -622,14 +1704,15 @@ async def create_suggestion(suggestion_data: SuggestionCreate, current_user: dic
         "message": "Suggestion submitted successfully"
     }
 
-@api_router.get("/suggestions")
-async def get_all_suggestions(current_user: dict = Depends(get_owner_user)):
-    suggestions = await db.suggestions.find().sort("created_at", -1).to_list(1000)
+@api_router.get("/suggestions", response_model=Page[Suggestion])
+async def get_all_suggestions(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_owner_user)):
+    suggestions, next_cursor = await paginate(db.suggestions, {}, "created_at", limit, cursor, SUGGESTION_LIST_FIELDS)
     
     result = []
     for suggestion in suggestions:
         result.append({
             "id": str(suggestion["_id"]),
+            "user_id": suggestion["user_id"],
             "user_name": suggestion["user_name"],
             "category": suggestion.get("category"),
             "question_type": suggestion.get("question_type"),
@@ -640,7 +1723,7 @@ async def get_all_suggestions(current_user: dict = Depends(get_owner_user)):
             "status": suggestion.get("status", "pending")
         })
     
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 @api_router.delete("/suggestions/{suggestion_id}")
 async def delete_suggestion(suggestion_id: str, current_user: dict = Depends(get_owner_user)):
@@ -656,9 +1739,9 @@ async def delete_suggestion(suggestion_id: str, current_user: dict = Depends(get
         raise HTTPException(status_code=400, detail=str(e))
 
 # Get all team applications (owner only)
-@api_router.get("/admin/team-applications")
-async def get_team_applications(current_user: dict = Depends(get_owner_user)):
-    applications = await db.team_applications.find().sort("created_at", -1).to_list(1000)
+@api_router.get("/admin/team-applications", response_model=Page[TeamApplicationItem])
+async def get_team_applications(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_owner_user)):
+    applications, next_cursor = await paginate(db.team_applications, {}, "created_at", limit, cursor, TEAM_APPLICATION_LIST_FIELDS)
     
     result = []
     for app in applications:
@@ -671,7 +1754,7 @@ async def get_team_applications(current_user: dict = Depends(get_owner_user)):
             "created_at": app.get("created_at")
         })
     
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 @api_router.delete("/admin/team-applications/{application_id}")
 async def delete_team_application(application_id: str, current_user: dict = Depends(get_owner_user)):
@@ -686,6 +1769,14 @@ async def delete_team_application(application_id: str, current_user: dict = Depe
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# In-process cache statistics (owner only)
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(current_user: dict = Depends(get_owner_user)):
+    return {
+        "users": user_cache.stats(),
+        "surveys": survey_cache.stats()
+    }
+
 # ===========================================
 # Featured Content / Destaques Endpoints
 # ===========================================
@@ -694,7 +1785,7 @@ async def delete_team_application(application_id: str, current_user: dict = Depe
 @api_router.put("/surveys/{survey_id}/feature")
 async def toggle_survey_feature(survey_id: str, current_user: dict = Depends(get_owner_user)):
     try:
-        survey = await db.surveys.find_one({"_id": ObjectId(survey_id)})
+        survey = await db.surveys.find_one({"_id": ObjectId(survey_id)}, {"featured": 1})
         if not survey:
             raise HTTPException(status_code=404, detail="Sondagem não encontrada")
         
@@ -709,8 +1800,10 @@ async def toggle_survey_feature(survey_id: str, current_user: dict = Depends(get
         
         await db.surveys.update_one(
             {"_id": ObjectId(survey_id)},
-            {"$set": {"featured": not current_featured}}
+            {"$set": {"featured": not current_featured}, "$inc": {"version": 1}}
         )
+        survey_cache.invalidate(survey_id)
+        invalidate_featured_cache()
         
         return {
             "message": "Destaque atualizado com sucesso",
@@ -721,14 +1814,30 @@ async def toggle_survey_feature(survey_id: str, current_user: dict = Depends(get
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-# Get all featured content for homepage
-@api_router.get("/featured")
-async def get_featured_content():
+# Featured payload, serialized once and reused until something featured changes.
+# `generation` is bumped on every invalidation, so a build that started before one
+# isn't stored after it.
+featured_cache = {"body": None, "etag": None, "expires_at": 0.0, "generation": 0}
+
+def invalidate_featured_cache():
+    featured_cache["body"] = None
+    featured_cache["generation"] += 1
+
+async def build_featured_content():
     featured_items = []
+    now = datetime.utcnow()
+    # Rebuild when the TTL lapses or a featured survey closes, whichever is first
+    expires_in = FEATURED_CACHE_TTL_SECONDS
     
     # Get featured surveys
-    featured_surveys = await db.surveys.find({"featured": True}).sort("created_at", -1).to_list(3)
+    featured_surveys = await db.surveys.find(
+        {"featured": True},
+        {"title": 1, "description": 1, "created_at": 1, "response_count": 1, "end_date": 1}
+    ).sort("created_at", -1).to_list(3)
     for survey in featured_surveys:
+        end_date = survey.get("end_date")
+        if end_date is not None and end_date > now:
+            expires_in = min(expires_in, (end_date - now).total_seconds())
         featured_items.append({
             "id": str(survey["_id"]),
             "type": "survey",
@@ -736,11 +1845,14 @@ async def get_featured_content():
             "description": survey["description"],
             "created_at": survey["created_at"],
             "response_count": survey.get("response_count", 0),
-            "is_closed": survey.get("end_date") is not None and datetime.utcnow() > survey.get("end_date")
+            "is_closed": end_date is not None and now > end_date
         })
     
     # Get featured news
-    featured_news = await db.news.find({"featured": True}).sort("created_at", -1).to_list(3)
+    featured_news = await db.news.find(
+        {"featured": True},
+        {"title": 1, "description": 1, "created_at": 1, "image_url": 1}
+    ).sort("created_at", -1).to_list(3)
     for news in featured_news:
         featured_items.append({
             "id": str(news["_id"]),
@@ -753,7 +1865,21 @@ async def get_featured_content():
     
     # Sort by created_at and limit to 3
     featured_items.sort(key=lambda x: x["created_at"], reverse=True)
-    return featured_items[:3]
+    return featured_items[:3], expires_in
+
+# Get all featured content for homepage
+@api_router.get("/featured")
+async def get_featured_content(request: Request):
+    body, etag = featured_cache["body"], featured_cache["etag"]
+    if body is None or featured_cache["expires_at"] < time.monotonic():
+        generation = featured_cache["generation"]
+        featured_items, expires_in = await build_featured_content()
+        body = orjson.dumps(featured_items)
+        etag = make_etag(body)
+        if featured_cache["generation"] == generation:
+            featured_cache.update(body=body, etag=etag, expires_at=time.monotonic() + expires_in)
+    
+    return conditional_response(request, body, etag, f"public, max-age={FEATURED_MAX_AGE_SECONDS}")
 
 # News CRUD endpoints
 class NewsCreate(BaseModel):
@@ -762,6 +1888,14 @@ class NewsCreate(BaseModel):
     image_url: Optional[str] = None
     featured: bool = False
 
+class NewsItem(BaseModel):
+    id: str
+    title: str
+    description: str
+    image_url: Optional[str] = None
+    featured: bool = False
+    created_at: datetime
+
 @api_router.post("/news")
 async def create_news(news_data: NewsCreate, current_user: dict = Depends(get_owner_user)):
     # Check featured limit
@@ -781,15 +1915,17 @@ async def create_news(news_data: NewsCreate, current_user: dict = Depends(get_ow
     }
     
     result = await db.news.insert_one(news_dict)
+    if news_data.featured:
+        invalidate_featured_cache()
     
     return {
         "id": str(result.inserted_id),
         "message": "Notícia criada com sucesso"
     }
 
-@api_router.get("/news")
-async def get_all_news(current_user: dict = Depends(get_owner_user)):
-    news_list = await db.news.find().sort("created_at", -1).to_list(100)
+@api_router.get("/news", response_model=Page[NewsItem])
+async def get_all_news(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_owner_user)):
+    news_list, next_cursor = await paginate(db.news, {}, "created_at", limit, cursor, NEWS_LIST_FIELDS)
     
     result = []
     for news in news_list:
@@ -802,12 +1938,12 @@ async def get_all_news(current_user: dict = Depends(get_owner_user)):
             "created_at": news["created_at"]
         })
     
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 @api_router.put("/news/{news_id}/feature")
 async def toggle_news_feature(news_id: str, current_user: dict = Depends(get_owner_user)):
     try:
-        news = await db.news.find_one({"_id": ObjectId(news_id)})
+        news = await db.news.find_one({"_id": ObjectId(news_id)}, {"featured": 1})
         if not news:
             raise HTTPException(status_code=404, detail="Notícia não encontrada")
         
@@ -824,6 +1960,7 @@ async def toggle_news_feature(news_id: str, current_user: dict = Depends(get_own
             {"_id": ObjectId(news_id)},
             {"$set": {"featured": not current_featured}}
         )
+        invalidate_featured_cache()
         
         return {
             "message": "Destaque atualizado com sucesso",
@@ -840,6 +1977,7 @@ async def delete_news(news_id: str, current_user: dict = Depends(get_owner_user)
         result = await db.news.delete_one({"_id": ObjectId(news_id)})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Notícia não encontrada")
+        invalidate_featured_cache()
         
         return {"message": "Notícia eliminada com sucesso"}
     except HTTPException:
@@ -847,9 +1985,604 @@ async def delete_news(news_id: str, current_user: dict = Depends(get_owner_user)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# ===========================================
+# Bulk import
+# ===========================================
+
+# Create many surveys at once (owner only)
+@api_router.post("/surveys/bulk")
+async def create_surveys_bulk(surveys_data: List[SurveyCreate], current_user: dict = Depends(get_owner_user)):
+    if len(surveys_data) > BULK_MAX_SURVEYS:
+        raise HTTPException(status_code=400, detail=f"No máximo {BULK_MAX_SURVEYS} sondagens por pedido")
+    try:
+        documents = [build_survey_document(survey_data, current_user) for survey_data in surveys_data]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    ids = []
+    for start in range(0, len(documents), BULK_CHUNK_SIZE):
+        result = await db.surveys.insert_many(documents[start:start + BULK_CHUNK_SIZE], ordered=False)
+        ids.extend(str(inserted_id) for inserted_id in result.inserted_ids)
+    
+    return {"message": "Sondagens criadas com sucesso", "inserted": len(ids), "ids": ids}
+
+class ResponseImport(BaseModel):
+    user_id: Optional[str] = None  # respondents without an account get a generated id
+    user_name: str = ""
+    answers: List[AnswerModel]
+    submitted_at: Optional[datetime] = None
+    respondent: Optional[Dict[str, Any]] = None
+
+async def import_response_chunk(survey: dict, documents: list) -> dict:
+    """Insert a chunk of responses, then bump the counters once for the ones that landed."""
+    survey_id = str(survey["_id"])
+    
+    # Fill in missing demographics from respondents that have an account. Everyone
+    # else gets an all-unknown snapshot, so the demographics backfill skips them.
+    user_ids = [ObjectId(doc["user_id"]) for doc in documents if "respondent" not in doc and ObjectId.is_valid(doc["user_id"])]
+    users = {}
+    if user_ids:
+        users = {
+            str(user["_id"]): user
+            async for user in db.users.find({"_id": {"$in": user_ids}}, RESPONDENT_SNAPSHOT_FIELDS)
+        }
+    for doc in documents:
+        if "respondent" not in doc:
+            doc["respondent"] = build_respondent_snapshot(users.get(doc["user_id"], {}))
+    
+    failed = {}
+    try:
+        await db.responses.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        failed = {error["index"]: error for error in e.details["writeErrors"]}
+    inserted = [doc for idx, doc in enumerate(documents) if idx not in failed]
+    
+    if inserted:
+        totals = {}
+        for doc in inserted:
+            for path, amount in build_results_increments(survey["questions"], doc["answers"]).items():
+                totals[path] = totals.get(path, 0) + amount
+        counted, _ = await asyncio.gather(
+            db.surveys.update_one({"_id": survey["_id"]}, {"$inc": {"response_count": len(inserted)}}),
+            db.survey_results.update_one({"_id": survey_id}, {"$inc": totals}, upsert=True)
+        )
+        if counted.matched_count == 0:
+            # Deleted since this worker cached it, or mid-import
+            await asyncio.gather(
+                db.responses.delete_many({"_id": {"$in": [doc["_id"] for doc in inserted]}}),
+                db.survey_results.delete_one({"_id": survey_id})
+            )
+            survey_cache.invalidate(survey_id)
+            raise HTTPException(status_code=404, detail="Survey not found")
+    
+    return {
+        "inserted": len(inserted),
+        "duplicates": sum(1 for error in failed.values() if error["code"] == 11000),
+        "failed": [error for error in failed.values() if error["code"] != 11000]
+    }
+
+# Import historical responses from an NDJSON body, one response per line (owner only)
+@api_router.post("/surveys/{survey_id}/responses/import")
+async def import_responses(survey_id: str, request: Request, current_user: dict = Depends(get_owner_user)):
+    try:
+        survey = await get_survey_definition(survey_id)
+        if not survey:
+            raise HTTPException(status_code=404, detail="Survey not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    summary = {"inserted": 0, "duplicates": 0, "error_count": 0, "errors": []}
+    
+    def report_error(line_number: int, detail: str):
+        summary["error_count"] += 1
+        if len(summary["errors"]) < BULK_MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line_number, "detail": detail})
+    
+    async def flush(chunk: list):
+        result = await import_response_chunk(survey, [doc for _, doc in chunk])
+        summary["inserted"] += result["inserted"]
+        summary["duplicates"] += result["duplicates"]
+        for error in result["failed"]:
+            report_error(chunk[error["index"]][0], error.get("errmsg", "Write error"))
+    
+    def parse_line(line_number: int, line: bytes) -> Optional[dict]:
+        try:
+            item = ResponseImport.model_validate_json(line)
+        except ValidationError as e:
+            report_error(line_number, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'line'}: {error['msg']}" for error in e.errors()
+            ))
+            return None
+        return {
+            "survey_id": survey_id,
+            "user_id": item.user_id or f"import-{ObjectId()}",
+            "user_name": item.user_name,
+            "answers": [answer.dict() for answer in item.answers],
+            **({"respondent": item.respondent} if item.respondent is not None else {}),
+            "submitted_at": item.submitted_at or datetime.utcnow()
+        }
+    
+    # The body is read as it arrives and written BULK_CHUNK_SIZE responses at a time
+    chunk, pending, line_number = [], b"", 0
+    async for data in request.stream():
+        lines = (pending + data).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            line_number += 1
+            doc = parse_line(line_number, line) if line.strip() else None
+            if doc:
+                chunk.append((line_number, doc))
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                await flush(chunk)
+                chunk = []
+    if pending.strip():
+        line_number += 1
+        doc = parse_line(line_number, pending)
+        if doc:
+            chunk.append((line_number, doc))
+    if chunk:
+        await flush(chunk)
+    
+    if summary["inserted"]:
+        notify_live_results(survey_id)
+    
+    return summary
+
+# ===========================================
+# Background jobs
+# ===========================================
+
+# Heavy owner operations are queued in db.jobs and run by worker tasks:
+#   {"type", "params", "status": queued|running|done|failed, "attempts", "result",
+#    "error", "created_by", "created_at", "started_at", "finished_at"}
+# Workers claim jobs atomically, so any number of them can share the queue. A job
+# left running by a worker that died is picked up again after JOB_STALE_SECONDS,
+# so job handlers must be safe to re-run.
+job_wakeup = asyncio.Event()
+job_worker_tasks = []
+export_cleanup = {"last_run": 0.0}
+
+async def enqueue_job(job_type: str, params: dict, user: dict) -> str:
+    result = await db.jobs.insert_one({
+        "type": job_type,
+        "params": params,
+        "status": "queued",
+        "attempts": 0,
+        "created_by": str(user["_id"]),
+        "created_at": datetime.utcnow()
+    })
+    job_wakeup.set()
+    return str(result.inserted_id)
+
+async def run_delete_survey_data_job(params: dict) -> dict:
+    """Delete a deleted survey's responses in batches, then its results."""
+    survey_id = params["survey_id"]
+    deleted = 0
+    while True:
+        batch = [
+            response["_id"] async for response in
+            db.responses.find({"survey_id": survey_id}, {"_id": 1}).limit(JOB_DELETE_BATCH_SIZE)
+        ]
+        if not batch:
+            break
+        result = await db.responses.delete_many({"_id": {"$in": batch}})
+        deleted += result.deleted_count
+        await asyncio.sleep(JOB_BATCH_PAUSE_SECONDS)
+    await db.survey_results.delete_one({"_id": survey_id})
+    return {"deleted_responses": deleted}
+
+async def run_rebuild_results_job(params: dict) -> dict:
+    survey = await get_survey_definition(params["survey_id"])
+    if not survey:
+        raise ValueError("Survey not found")
+    aggregates = await rebuild_survey_results(survey)
+    return {"total_responses": aggregates["total_responses"]}
+
+async def run_export_responses_job(params: dict) -> dict:
+    """Write the export to GridFS (bucket "exports")."""
+    survey = await get_survey_definition(params["survey_id"])
+    if not survey:
+        raise ValueError("Survey not found")
+    export_format = params["format"]
+    filename = f"survey-{params['survey_id']}.{export_format}"
+    
+    bucket = AsyncIOMotorGridFSBucket(db, bucket_name="exports")
+    upload = bucket.open_upload_stream(filename, metadata={"media_type": EXPORT_MEDIA_TYPES[export_format]})
+    try:
+        async for chunk in iter_export_chunks(survey, export_format):
+            await upload.write(chunk.encode('utf-8'))
+        await upload.close()
+    except BaseException:
+        await upload.abort()
+        raise
+    return {
+        "file_id": str(upload._id),
+        "filename": filename,
+        "media_type": EXPORT_MEDIA_TYPES[export_format],
+        "expires_at": datetime.utcnow() + timedelta(seconds=EXPORT_RETENTION_SECONDS)
+    }
+
+async def delete_expired_exports() -> int:
+    """Delete export files older than EXPORT_RETENTION_SECONDS from GridFS."""
+    cutoff = datetime.utcnow() - timedelta(seconds=EXPORT_RETENTION_SECONDS)
+    expired = await db["exports.files"].find({"uploadDate": {"$lt": cutoff}}, {"_id": 1}).to_list(None)
+    bucket = AsyncIOMotorGridFSBucket(db, bucket_name="exports")
+    deleted = 0
+    for export in expired:
+        try:
+            await bucket.delete(export["_id"])
+            deleted += 1
+        except NoFile:
+            # Another worker deleted it first
+            pass
+    return deleted
+
+JOB_HANDLERS = {
+    "delete_survey_data": run_delete_survey_data_job,
+    "rebuild_results": run_rebuild_results_job,
+    "export_responses": run_export_responses_job,
+}
+
+async def claim_next_job() -> Optional[dict]:
+    now = datetime.utcnow()
+    return await db.jobs.find_one_and_update(
+        {"$or": [
+            {"status": "queued"},
+            {"status": "running", "started_at": {"$lt": now - timedelta(seconds=JOB_STALE_SECONDS)}}
+        ]},
+        {"$set": {"status": "running", "started_at": now}, "$inc": {"attempts": 1}},
+        sort=[("created_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def run_job(job: dict):
+    try:
+        handler = JOB_HANDLERS.get(job["type"])
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job['type']}")
+        result = await handler(job["params"])
+        update = {"status": "done", "result": result, "error": None, "finished_at": datetime.utcnow()}
+    except Exception as e:
+        logger.error(f"Job {job['_id']} ({job['type']}) failed on attempt {job['attempts']}: {e}")
+        if job["attempts"] < JOB_MAX_ATTEMPTS:
+            update = {"status": "queued", "error": str(e)}
+        else:
+            update = {"status": "failed", "error": str(e), "finished_at": datetime.utcnow()}
+    await db.jobs.update_one({"_id": job["_id"]}, {"$set": update})
+
+async def delete_expired_exports_periodically():
+    if time.monotonic() - export_cleanup["last_run"] < EXPORT_CLEANUP_INTERVAL_SECONDS:
+        return
+    export_cleanup["last_run"] = time.monotonic()
+    try:
+        deleted = await delete_expired_exports()
+        if deleted:
+            logger.info(f"Deleted {deleted} expired export files")
+    except Exception as e:
+        logger.error(f"Could not delete expired exports: {e}")
+
+async def job_worker():
+    while True:
+        # Cleared before claiming so a job queued meanwhile wakes us straight away
+        job_wakeup.clear()
+        try:
+            job = await claim_next_job()
+        except Exception as e:
+            logger.error(f"Could not claim a job: {e}")
+            job = None
+        
+        if job is None:
+            await delete_expired_exports_periodically()
+            try:
+                await asyncio.wait_for(job_wakeup.wait(), timeout=JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        
+        await run_job(job)
+
+def format_job(job: dict) -> dict:
+    return {
+        "id": str(job["_id"]),
+        "type": job["type"],
+        "params": job["params"],
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at")
+    }
+
+@api_router.get("/jobs")
+async def get_jobs(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_owner_user)):
+    jobs, next_cursor = await paginate(db.jobs, {}, "created_at", limit, cursor)
+    return {"items": [format_job(job) for job in jobs], "next_cursor": next_cursor}
+
+@api_router.get("/jobs/{job_id}")
+async def get_job(job_id: str, current_user: dict = Depends(get_owner_user)):
+    try:
+        job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return format_job(job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@api_router.get("/jobs/{job_id}/download")
+async def download_job_result(job_id: str, current_user: dict = Depends(get_owner_user)):
+    try:
+        job = await db.jobs.find_one({"_id": ObjectId(job_id)}, {"type": 1, "status": 1, "result": 1})
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job["type"] != "export_responses" or job["status"] != "done":
+            raise HTTPException(status_code=409, detail="Exportação ainda não está pronta")
+        
+        bucket = AsyncIOMotorGridFSBucket(db, bucket_name="exports")
+        try:
+            download = await bucket.open_download_stream(ObjectId(job["result"]["file_id"]))
+        except NoFile:
+            raise HTTPException(status_code=410, detail="Esta exportação expirou. Peça uma nova exportação.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def stream_file():
+        while True:
+            chunk = await download.readchunk()
+            if not chunk:
+                break
+            yield chunk
+    
+    return StreamingResponse(
+        stream_file(),
+        media_type=job["result"]["media_type"],
+        headers={"Content-Disposition": f'attachment; filename="{job["result"]["filename"]}"'}
+    )
+
+# ===========================================
+# Request profiling
+# ===========================================
+
+def profiling_requested(scope) -> bool:
+    headers = dict(scope["headers"])
+    if headers.get(b"x-profile") in (b"1", b"true"):
+        return True
+    query = scope.get("query_string", b"").decode("latin-1")
+    return any(param in ("profile=1", "profile=true") for param in query.split("&"))
+
+class ProfilingMiddleware:
+    """Run owner requests that ask for it under pyinstrument and store the capture in db.profiles.
+    
+    The capture id is returned in the X-Profile-Id response header. The flag is
+    ignored on requests that aren't from an owner.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        # The flag only means something from an owner; anyone else is served as usual
+        request = Request(scope)
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        try:
+            if scheme.lower() != "bearer" or not token:
+                raise HTTPException(status_code=401, detail="Not authenticated")
+            user = await get_owner_user(await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token)))
+        except HTTPException:
+            await self.app(scope, receive, send)
+            return
+        
+        profile_id = ObjectId()
+        status_code = 500
+        
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", str(profile_id).encode())]
+            await send(message)
+        
+        profiler = Profiler(interval=PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            duration = time.perf_counter() - start
+            route = scope.get("route")
+            try:
+                await db.profiles.insert_one({
+                    "_id": profile_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route.path if route is not None else None,
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 1),
+                    "user_id": str(user["_id"]),
+                    "text": profiler.output_text(unicode=True, color=False),
+                    "html": profiler.output_html(),
+                    "created_at": datetime.utcnow()
+                })
+            except Exception as e:
+                logger.error(f"Could not store profile {profile_id}: {e}")
+
+PROFILE_LIST_FIELDS = {"method": 1, "path": 1, "route": 1, "status": 1, "duration_ms": 1, "created_at": 1}
+
+# Recent profiler captures (owner only)
+@api_router.get("/admin/profiles")
+async def get_profiles(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), cursor: Optional[str] = None, current_user: dict = Depends(get_owner_user)):
+    profiles, next_cursor = await paginate(db.profiles, {}, "created_at", limit, cursor, PROFILE_LIST_FIELDS)
+    return {
+        "items": [{
+            "id": str(profile["_id"]),
+            "method": profile["method"],
+            "path": profile["path"],
+            "route": profile.get("route"),
+            "status": profile.get("status"),
+            "duration_ms": profile["duration_ms"],
+            "created_at": profile["created_at"]
+        } for profile in profiles],
+        "next_cursor": next_cursor
+    }
+
+# A capture as a call tree (text) or pyinstrument's interactive flame view (html)
+@api_router.get("/admin/profiles/{profile_id}")
+async def get_profile_capture(
+    profile_id: str,
+    output_format: str = Query("text", alias="format", pattern="^(text|html)$"),
+    current_user: dict = Depends(get_owner_user)
+):
+    try:
+        profile = await db.profiles.find_one({"_id": ObjectId(profile_id)}, {output_format: 1})
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if output_format == "html":
+        return HTMLResponse(profile["html"])
+    return HTTPResponse(content=profile["text"], media_type="text/plain")
+
+# ===========================================
+# Database indexes
+# ===========================================
+
+# Indexes backing the queries above; list endpoints sort by (created_at|submitted_at, _id)
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        IndexModel([("role", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="role_created_at"),
+    ],
+    "surveys": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at"),
+        IndexModel([("featured", ASCENDING), ("created_at", DESCENDING)], name="featured_created_at"),
+    ],
+    "responses": [
+        IndexModel([("survey_id", ASCENDING), ("user_id", ASCENDING)], unique=True, name="survey_user_unique"),
+        IndexModel([("survey_id", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)], name="survey_submitted_at"),
+        IndexModel([("user_id", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)], name="user_submitted_at"),
+    ],
+    "news": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at"),
+        IndexModel([("featured", ASCENDING), ("created_at", DESCENDING)], name="featured_created_at"),
+    ],
+    "suggestions": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at"),
+    ],
+    "team_applications": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at"),
+    ],
+    "profiles": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at"),
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=PROFILE_RETENTION_SECONDS, name="created_at_ttl"),
+    ],
+    "jobs": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at"),
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+    ],
+    # GridFS files of the "exports" bucket, found by age by delete_expired_exports
+    "exports.files": [
+        IndexModel([("uploadDate", ASCENDING)], name="upload_date"),
+    ],
+}
+
+# Indexes the API needs for correctness, not only speed: submit_response relies on
+# survey_user_unique alone to reject a second answer from the same user
+REQUIRED_INDEXES = {("responses", "survey_user_unique")}
+
+async def ensure_indexes():
+    """Create any missing index in INDEXES. Safe to run on every startup.
+    
+    Raises if a REQUIRED_INDEXES index can't be created, so the API doesn't start
+    without it.
+    """
+    start = time.perf_counter()
+    created = 0
+    for collection_name, indexes in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        for index in indexes:
+            name = index.document["name"]
+            if name in existing:
+                continue
+            try:
+                await collection.create_indexes([index])
+                created += 1
+                logger.info(f"Created index {collection_name}.{name}")
+            except Exception as e:
+                if (collection_name, name) in REQUIRED_INDEXES:
+                    raise RuntimeError(
+                        f"Could not create required index {collection_name}.{name}: {e}. "
+                        "If it failed on duplicate answers, run `python server.py dedupe-responses` first"
+                    ) from e
+                logger.error(f"Could not create index {collection_name}.{name}: {e}")
+    logger.info(f"Index bootstrap finished in {time.perf_counter() - start:.2f}s ({created} created)")
+
+# Index usage statistics (owner only)
+@api_router.get("/admin/indexes")
+async def get_index_stats(current_user: dict = Depends(get_owner_user)):
+    result = {}
+    for collection_name in INDEXES:
+        stats = await db[collection_name].aggregate([{"$indexStats": {}}]).to_list(None)
+        result[collection_name] = [{
+            "name": stat["name"],
+            "key": dict(stat["key"]),
+            "ops": stat["accesses"]["ops"],
+            "since": stat["accesses"]["since"]
+        } for stat in stats]
+    
+    return result
+
+# Prometheus metrics, see Metrics above
+@api_router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return HTTPResponse(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Include the router
 app.include_router(api_router)
 
+@app.middleware("http")
+async def add_etag_header(request: Request, call_next):
+    """ETag for JSON GET responses that don't set one, answering 304 when unchanged.
+    
+    Endpoints that can tell whether anything changed before building the response
+    (survey, results, profile) set a version ETag themselves and skip this.
+    """
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or "etag" in response.headers
+        or not response.headers.get("content-type", "").startswith("application/json")
+    ):
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = make_etag(body)
+    if etag_matches(request, etag):
+        return HTTPResponse(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    headers.setdefault("cache-control", "private, no-cache")
+    return HTTPResponse(content=body, status_code=response.status_code, headers=headers)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -858,6 +2591,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def log_slow_request(method: str, route: str, status_code: int, duration: float, stats: RequestStats):
+    entry = {
+        "method": method,
+        "route": route,
+        "status": status_code,
+        "user_role": stats.user_role,
+        "duration_ms": round(duration * 1000, 1),
+        "mongo_commands": len(stats.commands),
+        "mongo_ms": round(sum(command["seconds"] for command in stats.commands) * 1000, 1),
+        "commands": [{
+            "command": command["command"],
+            "collection": command["collection"],
+            "filter": query_shape(command["filter"]),
+            "duration_ms": round(command["seconds"] * 1000, 2),
+            "docs": command["docs"]
+        } for command in stats.commands[:SLOW_REQUEST_MAX_COMMANDS]]
+    }
+    if len(stats.commands) > SLOW_REQUEST_MAX_COMMANDS:
+        entry["commands_truncated"] = len(stats.commands) - SLOW_REQUEST_MAX_COMMANDS
+    logger.warning(f"Slow request {json.dumps(entry, default=str)}")
+
+class MetricsMiddleware:
+    """Record latency, status and Mongo commands of every request under its route template,
+    and log the requests slower than SLOW_REQUEST_THRESHOLD_MS (streaming routes excepted)."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_stats.reset(token)
+            # The router stores the matched route in the scope; label unmatched
+            # paths together so scanners can't blow up the number of series
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            duration = time.perf_counter() - start
+            metrics.observe_request(scope["method"], route_path, status_code, duration, stats)
+            if (SLOW_REQUEST_THRESHOLD_MS and duration * 1000 >= SLOW_REQUEST_THRESHOLD_MS
+                    and route_path not in SLOW_REQUEST_EXCLUDED_ROUTES):
+                log_slow_request(scope["method"], route_path, status_code, duration, stats)
+
+app.add_middleware(ProfilingMiddleware)
+# Added last so it's the outermost middleware and times the others too
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -865,6 +2660,86 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_db_indexes():
+    await ensure_indexes()
+
+@app.on_event("startup")
+async def rebuild_missing_results():
+    rebuilt = await rebuild_missing_survey_results()
+    if rebuilt:
+        logger.info(f"Rebuilt results for {rebuilt} surveys answered before results were pre-aggregated")
+
+survey_watcher_task = None
+
+@app.on_event("startup")
+async def start_survey_cache_watcher():
+    global survey_watcher_task
+    if SURVEY_CACHE_CHANGE_STREAM:
+        survey_watcher_task = asyncio.create_task(watch_survey_changes())
+
+@app.on_event("startup")
+async def start_job_workers():
+    for _ in range(JOB_WORKERS):
+        job_worker_tasks.append(asyncio.create_task(job_worker()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if survey_watcher_task:
+        survey_watcher_task.cancel()
+    for task in job_worker_tasks:
+        task.cancel()
     client.close()
+    password_executor.shutdown(wait=False)
+
+async def rebuild_all_survey_results(survey_ids: Optional[List[str]] = None):
+    query = {"_id": {"$in": [ObjectId(survey_id) for survey_id in survey_ids]}} if survey_ids else {}
+    async for survey in db.surveys.find(query, {"questions": 1}):
+        aggregates = await rebuild_survey_results(survey)
+        logger.info(f"Rebuilt results for survey {survey['_id']} ({aggregates['total_responses']} responses)")
+
+async def dedupe_responses() -> int:
+    """Keep only the first response of each user to each survey, then rebuild the affected results.
+    
+    Needed before survey_user_unique can be built on data that has duplicate answers.
+    """
+    pipeline = [
+        {"$sort": {"submitted_at": 1, "_id": 1}},
+        {"$group": {"_id": {"survey_id": "$survey_id", "user_id": "$user_id"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}}
+    ]
+    deleted = 0
+    survey_ids = set()
+    async for duplicates in db.responses.aggregate(pipeline, allowDiskUse=True):
+        result = await db.responses.delete_many({"_id": {"$in": duplicates["ids"][1:]}})
+        deleted += result.deleted_count
+        if ObjectId.is_valid(duplicates["_id"]["survey_id"]):
+            survey_ids.add(duplicates["_id"]["survey_id"])
+    if survey_ids:
+        await rebuild_all_survey_results(list(survey_ids))
+    return deleted
+
+if __name__ == "__main__":
+    # Maintenance commands, e.g. `python server.py rebuild-results [survey_id ...]`
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="IMPAR backend maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = subparsers.add_parser("rebuild-results", help="Recompute pre-aggregated survey results from responses")
+    rebuild_parser.add_argument("survey_ids", nargs="*", help="Surveys to rebuild (default: all)")
+    subparsers.add_parser("backfill-demographics", help="Copy respondent demographics onto older responses")
+    subparsers.add_parser("dedupe-responses", help="Delete repeated answers by the same user so the unique responses index can be built")
+    jobs_parser = subparsers.add_parser("run-jobs", help="Run background job workers (when the API runs with JOB_WORKERS=0)")
+    jobs_parser.add_argument("--workers", type=int, default=max(JOB_WORKERS, 1))
+    args = parser.parse_args()
+    
+    if args.command == "rebuild-results":
+        asyncio.run(rebuild_all_survey_results(args.survey_ids))
+    elif args.command == "backfill-demographics":
+        logger.info(f"Backfilled demographics on {asyncio.run(backfill_respondent_snapshots())} responses")
+    elif args.command == "dedupe-responses":
+        logger.info(f"Deleted {asyncio.run(dedupe_responses())} duplicate responses")
+    elif args.command == "run-jobs":
+        async def run_workers():
+            await asyncio.gather(*[job_worker() for _ in range(args.workers)])
+        asyncio.run(run_workers())
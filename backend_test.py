@@ -226,7 +226,7 @@ class SurveyAppTester:
                 response = self.make_request("GET", "/surveys", token=self.owner_token)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = response.json().get("items")
                     if isinstance(data, list):
                         self.log_test("Survey Listing (Owner)", True, f"Retrieved {len(data)} surveys")
                         
@@ -252,7 +252,7 @@ class SurveyAppTester:
                 response = self.make_request("GET", "/surveys", token=self.user_token)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = response.json().get("items")
                     if isinstance(data, list):
                         self.log_test("Survey Listing (User)", True, f"User retrieved {len(data)} surveys")
                     else:
@@ -337,7 +337,7 @@ class SurveyAppTester:
                     self.log_test("Survey Response Submission", True, "Successfully submitted survey response")
                 else:
                     self.log_test("Survey Response Submission", False, "Missing message in response", data)
-            elif response.status_code == 400 and "already answered" in response.text:
+            elif response.status_code == 409 and "already answered" in response.text:
                 self.log_test("Survey Response Submission", True, "User has already answered (duplicate prevention working)")
             else:
                 self.log_test("Survey Response Submission", False, f"Response submission failed with status {response.status_code}", response.text)
@@ -350,7 +350,7 @@ class SurveyAppTester:
             response = self.make_request("POST", f"/surveys/{TEST_SURVEY_ID}/respond", 
                                        token=self.user_token, data=response_data)
             
-            if response.status_code == 400 and "already answered" in response.text:
+            if response.status_code == 409 and "already answered" in response.text:
                 self.log_test("Duplicate Response Prevention", True, "Correctly prevented duplicate response")
             else:
                 self.log_test("Duplicate Response Prevention", False, f"Should have prevented duplicate, got {response.status_code}")
@@ -406,7 +406,7 @@ class SurveyAppTester:
             response = self.make_request("GET", f"/surveys/{TEST_SURVEY_ID}/responses", token=self.owner_token)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response.json().get("items")
                 if isinstance(data, list):
                     self.log_test("Owner Individual Responses", True, f"Owner retrieved {len(data)} individual responses")
                     
@@ -451,7 +451,7 @@ class SurveyAppTester:
             response = self.make_request("GET", "/my-responses", token=self.user_token)
             
             if response.status_code == 200:
-                data = response.json()
+                data = response.json().get("items")
                 if isinstance(data, list):
                     self.log_test("My Responses", True, f"User has {len(data)} answered surveys")
                     
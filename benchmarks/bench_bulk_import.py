@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark response import throughput: one submit per response vs the NDJSON bulk import.
+
+Imports RESPONSES responses (default 20k) into a four-question survey, first by
+calling POST /surveys/{id}/respond once per response (as a migration script using
+the public API would) and then through POST /surveys/{id}/responses/import, and
+reports responses/sec and Mongo round trips for each.
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_bulk_import.py
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+
+from starlette.requests import Request
+
+from common import connect, print_table
+
+import server
+
+RESPONSES = int(os.environ.get("RESPONSES", 20_000))
+# The per-response path is slow, so its rate is measured on a smaller sample
+SINGLE_SAMPLE = int(os.environ.get("SINGLE_SAMPLE", 2_000))
+STREAM_CHUNK_BYTES = 64 * 1024
+
+QUESTIONS = [
+    {"type": "multiple_choice_single", "text": "Partido", "options": ["A", "B", "C", "D"]},
+    {"type": "multiple_choice_multiple", "text": "Temas", "options": ["Saude", "Habitacao", "Economia", "Ensino"]},
+    {"type": "rating", "text": "Avaliacao", "max_rating": 5},
+    {"type": "text_short", "text": "Comentario"},
+]
+
+
+def random_answers(rng: random.Random, i: int) -> list:
+    return [
+        {"question_index": 0, "answer": rng.choice(QUESTIONS[0]["options"])},
+        {"question_index": 1, "answer": rng.sample(QUESTIONS[1]["options"], rng.randint(1, 3))},
+        {"question_index": 2, "answer": rng.randint(1, 5)},
+        {"question_index": 3, "answer": f"comentario {i}"},
+    ]
+
+
+def ndjson_request(body: bytes) -> Request:
+    """A Request whose body arrives in STREAM_CHUNK_BYTES pieces, like an upload."""
+    chunks = [body[i:i + STREAM_CHUNK_BYTES] for i in range(0, len(body), STREAM_CHUNK_BYTES)]
+
+    async def receive():
+        chunk = chunks.pop(0) if chunks else b""
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": []}, receive)
+
+
+async def create_survey(db, owner: dict) -> str:
+    survey = server.build_survey_document(server.SurveyCreate(
+        title="Importação", description="Benchmark", questions=QUESTIONS
+    ), owner)
+    return str((await db.surveys.insert_one(survey)).inserted_id)
+
+
+async def single_submits(survey_id: str, rng: random.Random) -> int:
+    for i in range(SINGLE_SAMPLE):
+        user = {"_id": f"single-{i}", "name": f"User {i}", "gender": "Feminino", "birth_date": "01/01/1980"}
+        await server.submit_response(survey_id, server.ResponseCreate(answers=random_answers(rng, i)), current_user=user)
+    return SINGLE_SAMPLE
+
+
+async def bulk_import(survey_id: str, rng: random.Random, owner: dict) -> int:
+    body = "".join(json.dumps({
+        "user_id": f"bulk-{i}",
+        "user_name": f"User {i}",
+        "answers": random_answers(rng, i),
+        "respondent": {"gender": "Feminino", "age_band": "45-54"}
+    }) + "\n" for i in range(RESPONSES)).encode("utf-8")
+    summary = await server.import_responses(survey_id, ndjson_request(body), current_user=owner)
+    assert summary["inserted"] == RESPONSES, summary
+    return summary["inserted"]
+
+
+async def main():
+    client, db, counter = connect("impar_bench_bulk_import")
+    await client.drop_database(db.name)
+    try:
+        await server.ensure_indexes()
+        owner = {"_id": "bench-owner", "name": "Owner", "role": "owner"}
+        rng = random.Random(42)
+
+        rows = []
+        for name, run in [
+            ("one submit per response", lambda survey_id: single_submits(survey_id, rng)),
+            ("NDJSON bulk import", lambda survey_id: bulk_import(survey_id, rng, owner)),
+        ]:
+            survey_id = await create_survey(db, owner)
+            server.survey_cache.clear()
+            counter.reset()
+            start = time.perf_counter()
+            inserted = await run(survey_id)
+            elapsed = time.perf_counter() - start
+            results = await db.survey_results.find_one({"_id": survey_id})
+            assert results["total_responses"] == inserted
+            rows.append({
+                "strategy": name,
+                "responses": inserted,
+                "seconds": round(elapsed, 2),
+                "responses_per_s": round(inserted / elapsed),
+                "round_trips_per_response": round(counter.count / inserted, 3),
+            })
+
+        print(f"Importing responses into a {len(QUESTIONS)}-question survey")
+        print_table(rows)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Load test: survey listing latency during a concurrent login storm.
+
+Measures GET /api/surveys latency while LOGINS concurrent logins are in flight,
+first with bcrypt verified inline on the event loop (the original login) and then
+with the thread-pool login in server.py. With the pool the listing latency should
+stay close to the idle baseline.
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_login_storm.py
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import bcrypt
+
+from common import connect, percentile, print_table
+
+import server
+
+USERS = int(os.environ.get("USERS", 50))
+LOGINS = int(os.environ.get("LOGINS", 200))
+SURVEYS = int(os.environ.get("SURVEYS", 50))
+PASSWORD = "benchmark123"
+
+
+async def inline_login(credentials: server.UserLogin):
+    """The original login, verifying bcrypt synchronously inside the handler."""
+    user = await server.db.users.find_one({"email": credentials.email})
+    if not user or not bcrypt.checkpw(credentials.password.encode('utf-8'), user["password"].encode('utf-8')):
+        raise server.HTTPException(status_code=401, detail="Invalid email or password")
+    return server.create_access_token({"sub": str(user["_id"])})
+
+
+async def seed(db):
+    now = datetime.utcnow()
+    hashed = await server.hash_password(PASSWORD)
+    await db.users.insert_many([{
+        "email": f"storm{i}@impar.pt",
+        "password": hashed,
+        "name": f"Storm {i}",
+        "role": "user",
+        "created_at": now
+    } for i in range(USERS)])
+    await db.surveys.insert_many([{
+        "title": f"Sondagem {i}",
+        "description": "Benchmark",
+        "questions": [],
+        "created_by": "bench",
+        "created_at": now - timedelta(minutes=i),
+        "response_count": 0,
+        "end_date": None
+    } for i in range(SURVEYS)])
+    return await db.users.find_one({"email": "storm0@impar.pt"})
+
+
+async def listing_latencies(user: dict, stop: asyncio.Event):
+    samples = []
+    loop = asyncio.get_running_loop()
+    interval = 0.005
+    while not stop.is_set():
+        # Time from when the request should have started, so event-loop stalls count
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        await server.get_surveys(limit=server.DEFAULT_PAGE_SIZE, cursor=None, current_user=user)
+        samples.append((loop.time() - scheduled) * 1000)
+    return samples
+
+
+async def phase(name: str, user: dict, login=None) -> dict:
+    stop = asyncio.Event()
+    listing = asyncio.create_task(listing_latencies(user, stop))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    if login:
+        await asyncio.gather(*[
+            login(server.UserLogin(email=f"storm{i % USERS}@impar.pt", password=PASSWORD))
+            for i in range(LOGINS)
+        ])
+    else:
+        await asyncio.sleep(2)
+    elapsed = loop.time() - start
+    stop.set()
+    samples = await listing
+    return {
+        "phase": name,
+        "logins_per_s": round(LOGINS / elapsed, 1) if login else "-",
+        "listing_calls": len(samples),
+        "listing_p50_ms": round(percentile(samples, 50), 2),
+        "listing_p95_ms": round(percentile(samples, 95), 2),
+        "listing_max_ms": round(max(samples), 2) if samples else 0.0,
+    }
+
+
+async def main():
+    client, db, _ = connect("impar_bench_login_storm")
+    await client.drop_database(db.name)
+    try:
+        user = await seed(db)
+        rows = [
+            await phase("idle", user),
+            await phase("storm, inline bcrypt", user, inline_login),
+            await phase("storm, thread pool", user, server.login),
+        ]
+        print(f"{LOGINS} concurrent logins (bcrypt rounds={server.BCRYPT_ROUNDS}, "
+              f"pool size={server.PASSWORD_HASH_CONCURRENCY})")
+        print_table(rows)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
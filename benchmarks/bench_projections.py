@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bytes each endpoint reads from MongoDB, with and without field projections.
+
+Seeds users with full profiles, surveys with QUESTIONS questions each, and responses,
+then calls every list endpoint (plus the get_current_user lookup) twice: with the
+projections declared in server.py, and with them switched off so whole documents
+are fetched. Reports the BSON bytes of the Mongo replies per call and p50 latency.
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_projections.py
+"""
+
+import asyncio
+import os
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from common import connect, measure, percentile, print_table
+
+import server
+
+SURVEYS = int(os.environ.get("SURVEYS", 200))
+QUESTIONS = int(os.environ.get("QUESTIONS", 30))
+RESPONSES = int(os.environ.get("RESPONSES", 200))
+ITERATIONS = int(os.environ.get("ITERATIONS", 20))
+
+PROJECTIONS = [
+    "USER_SESSION_FIELDS", "USER_LIST_FIELDS", "SURVEY_LIST_FIELDS", "RESPONSE_LIST_FIELDS",
+    "MY_RESPONSE_FIELDS", "SUGGESTION_LIST_FIELDS", "TEAM_APPLICATION_LIST_FIELDS", "NEWS_LIST_FIELDS",
+]
+
+PROFILE = {
+    "phone": "912345678", "birth_date": "01/01/1980", "gender": "Feminino", "nationality": "Portuguesa",
+    "district": "Lisboa", "municipality": "Lisboa", "parish": "Arroios", "marital_status": "Casado(a)",
+    "religion": "Católica", "education_level": "Licenciatura", "profession": "Engenheira",
+    "lived_abroad": True, "abroad_duration": "2 anos", "email_notifications": True,
+}
+
+
+@contextmanager
+def projections_disabled():
+    saved = {name: getattr(server, name) for name in PROJECTIONS}
+    for name in PROJECTIONS:
+        setattr(server, name, None)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(server, name, value)
+
+
+async def seed(db):
+    now = datetime.utcnow()
+    password = await server.hash_password("benchmark123")
+    users = [{
+        "email": f"user{i}@impar.pt", "password": password, "name": f"User {i}", "role": "user",
+        "created_at": now - timedelta(seconds=i), **PROFILE
+    } for i in range(RESPONSES)]
+    user_ids = (await db.users.insert_many(users)).inserted_ids
+
+    questions = [{
+        "type": "multiple_choice_single",
+        "text": f"Pergunta {q} sobre um tema de actualidade nacional?",
+        "options": [f"Opção {o} com uma descrição razoavelmente longa" for o in range(8)]
+    } for q in range(QUESTIONS)]
+    survey_ids = (await db.surveys.insert_many([{
+        "title": f"Sondagem {i}", "description": "Benchmark", "questions": questions,
+        "created_by": "bench", "created_at": now - timedelta(minutes=i),
+        "response_count": 0, "end_date": None, "version": 1
+    } for i in range(SURVEYS)])).inserted_ids
+
+    answers = [{"question_index": q, "answer": questions[q]["options"][0]} for q in range(QUESTIONS)]
+    await db.responses.insert_many([{
+        "survey_id": str(survey_ids[0]), "user_id": str(user_id), "user_name": users[i]["name"],
+        "answers": answers, "respondent": server.build_respondent_snapshot(users[i]),
+        "submitted_at": now - timedelta(seconds=i)
+    } for i, user_id in enumerate(user_ids)])
+    await db.responses.insert_many([{
+        "survey_id": str(survey_id), "user_id": str(user_ids[0]), "user_name": users[0]["name"],
+        "answers": answers, "submitted_at": now - timedelta(minutes=i)
+    } for i, survey_id in enumerate(survey_ids[1:])])
+
+    await db.suggestions.insert_many([{
+        "user_id": str(user_ids[0]), "user_name": "User 0", "category": "Política",
+        "question_type": "multiple_choice_single", "question_text": "Sugestão?", "options": ["A", "B"],
+        "notes": "Notas " * 50, "created_at": now - timedelta(minutes=i), "status": "pending"
+    } for i in range(50)])
+    await db.news.insert_many([{
+        "title": f"Notícia {i}", "description": "Texto " * 100, "image_url": "data:image/png;base64," + "A" * 20000,
+        "featured": False, "created_at": now - timedelta(minutes=i)
+    } for i in range(50)])
+
+    owner = {"_id": user_ids[0], "name": "Owner", "role": "owner"}
+    respondent = await db.users.find_one({"_id": user_ids[0]})
+    return owner, respondent, str(survey_ids[0])
+
+
+async def main():
+    client, db, counter = connect("impar_bench_projections", measure_bytes=True)
+    await client.drop_database(db.name)
+    try:
+        owner, respondent, survey_id = await seed(db)
+        token = server.create_access_token({"sub": str(respondent["_id"])})
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        page = {"limit": server.DEFAULT_PAGE_SIZE, "cursor": None}
+
+        async def current_user():
+            server.user_cache.clear()
+            return await server.get_current_user(credentials)
+
+        endpoints = [
+            ("get_current_user", current_user),
+            ("GET /surveys", lambda: server.get_surveys(**page, current_user=respondent)),
+            ("GET /surveys/{id}/responses", lambda: server.get_all_responses(survey_id, **page, current_user=owner)),
+            ("GET /my-responses", lambda: server.get_my_responses(**page, current_user=respondent)),
+            ("GET /admin/users", lambda: server.get_all_users(**page, current_user=owner)),
+            ("GET /suggestions", lambda: server.get_all_suggestions(**page, current_user=owner)),
+            ("GET /news", lambda: server.get_all_news(**page, current_user=owner)),
+        ]
+
+        rows = []
+        for name, call in endpoints:
+            row = {"endpoint": name}
+            for label, context in [("full", projections_disabled), ("projected", nullcontext)]:
+                with context():
+                    counter.reset()
+                    await call()
+                    row[f"{label}_bytes"] = counter.reply_bytes
+                    samples = await measure(call, ITERATIONS)
+                    row[f"{label}_p50_ms"] = round(percentile(samples, 50), 3)
+            row["saved"] = f"{1 - row['projected_bytes'] / row['full_bytes']:.0%}" if row["full_bytes"] else "-"
+            rows.append(row)
+
+        print(f"Mongo reply bytes per call ({SURVEYS} surveys x {QUESTIONS} questions, {RESPONSES} responses)")
+        print_table(rows)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark survey results aggregation: Python loops vs MongoDB aggregation pipeline.
+
+Seeds RESPONSES synthetic responses (default 100k) for a four-question survey and
+compares, for each strategy, the CPU time spent in this (API) process and the
+wall-clock latency:
+
+  * python loop       - load every response and count in Python (the original
+                        get_survey_results algorithm, without its 1000 cap)
+  * pipeline rebuild  - server.rebuild_survey_results ($unwind/$group in mongod)
+  * materialized read - GET /surveys/{id}/results reading survey_results
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_results_aggregation.py
+"""
+
+import asyncio
+import os
+import random
+import time
+from datetime import datetime
+
+from common import connect, endpoint_context, print_table
+
+import server
+
+RESPONSES = int(os.environ.get("RESPONSES", 100_000))
+ITERATIONS = int(os.environ.get("ITERATIONS", 5))
+BATCH = 5000
+
+QUESTIONS = [
+    {"type": "multiple_choice_single", "text": "Partido", "options": ["A", "B", "C", "D"]},
+    {"type": "multiple_choice_multiple", "text": "Temas", "options": ["Saude", "Habitacao", "Economia", "Ensino"]},
+    {"type": "rating", "text": "Avaliacao", "max_rating": 5},
+    {"type": "text_short", "text": "Comentario"},
+]
+
+
+async def python_loop_results(survey: dict):
+    """The original triple-nested loop over questions x responses x answers."""
+    responses = await server.db.responses.find({"survey_id": str(survey["_id"])}).to_list(None)
+    aggregated = []
+    for idx, question in enumerate(survey["questions"]):
+        if question["type"] in ["multiple_choice_single", "multiple_choice_multiple"]:
+            option_counts = {opt: 0 for opt in question.get("options", [])}
+            for response in responses:
+                for answer in response["answers"]:
+                    if answer["question_index"] == idx:
+                        chosen = [answer["answer"]] if question["type"] == "multiple_choice_single" else answer["answer"]
+                        for option in chosen:
+                            if option in option_counts:
+                                option_counts[option] += 1
+            aggregated.append(option_counts)
+        elif question["type"] == "rating":
+            ratings, rating_counts = [], {}
+            for response in responses:
+                for answer in response["answers"]:
+                    if answer["question_index"] == idx and isinstance(answer["answer"], (int, float)):
+                        ratings.append(answer["answer"])
+                        rating_counts[answer["answer"]] = rating_counts.get(answer["answer"], 0) + 1
+            aggregated.append({"average": sum(ratings) / len(ratings) if ratings else 0, "distribution": rating_counts})
+        else:
+            count = 0
+            for response in responses:
+                for answer in response["answers"]:
+                    if answer["question_index"] == idx:
+                        count += 1
+            aggregated.append({"count": count})
+    return aggregated
+
+
+async def seed(db):
+    now = datetime.utcnow()
+    survey = {
+        "title": "Benchmark",
+        "description": "Resultados",
+        "questions": QUESTIONS,
+        "created_by": "bench",
+        "created_at": now,
+        "response_count": RESPONSES,
+        "end_date": None
+    }
+    survey["_id"] = (await db.surveys.insert_one(survey)).inserted_id
+    user = {"_id": "bench-user", "name": "Bench", "role": "user"}
+
+    rng = random.Random(42)
+    for start in range(0, RESPONSES, BATCH):
+        await db.responses.insert_many([{
+            "survey_id": str(survey["_id"]),
+            "user_id": f"user-{i}",
+            "user_name": f"User {i}",
+            "answers": [
+                {"question_index": 0, "answer": rng.choice(QUESTIONS[0]["options"])},
+                {"question_index": 1, "answer": rng.sample(QUESTIONS[1]["options"], rng.randint(1, 3))},
+                {"question_index": 2, "answer": rng.randint(1, 5)},
+                {"question_index": 3, "answer": f"comentario {i}"},
+            ],
+            "submitted_at": now
+        } for i in range(start, min(start + BATCH, RESPONSES))])
+    # Let the benchmark user see results
+    await db.responses.insert_one({"survey_id": str(survey["_id"]), "user_id": "bench-user", "answers": [], "submitted_at": now})
+    return survey, user
+
+
+async def run(name: str, coro_factory) -> dict:
+    wall, cpu = [], []
+    for _ in range(ITERATIONS):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        await coro_factory()
+        cpu.append((time.process_time() - cpu_start) * 1000)
+        wall.append((time.perf_counter() - wall_start) * 1000)
+    return {
+        "name": name,
+        "iterations": ITERATIONS,
+        "cpu_ms_avg": round(sum(cpu) / len(cpu), 2),
+        "wall_ms_avg": round(sum(wall) / len(wall), 2),
+        "wall_ms_max": round(max(wall), 2),
+    }
+
+
+async def main():
+    client, db, _ = connect("impar_bench_results")
+    await client.drop_database(db.name)
+    try:
+        print(f"Seeding {RESPONSES} responses...")
+        survey, user = await seed(db)
+        survey_id = str(survey["_id"])
+
+        rows = [
+            await run("python loop", lambda: python_loop_results(survey)),
+            await run("pipeline rebuild", lambda: server.rebuild_survey_results(survey)),
+            await run("materialized read", lambda: server.get_survey_results(survey_id, current_user=user, **endpoint_context())),
+        ]
+
+        print(f"Results aggregation over {RESPONSES} responses")
+        print_table(rows)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark response serialization on a PAYLOAD-item list of survey responses.
+
+Builds the dict a list endpoint returns for PAYLOAD responses (default 10k) and
+times turning it into the response body the way FastAPI does:
+
+  * jsonable_encoder + json      - no response_model, JSONResponse (the original)
+  * jsonable_encoder + orjson    - no response_model, ORJSONResponse
+  * response_model + orjson      - Page[Response] validated and serialized by
+                                   pydantic-core, rendered by ORJSONResponse (current)
+
+Needs no database.
+
+    python benchmarks/bench_serialization.py
+"""
+
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from common import percentile, print_table
+
+import server
+
+PAYLOAD = int(os.environ.get("PAYLOAD", 10_000))
+ITERATIONS = int(os.environ.get("ITERATIONS", 10))
+
+
+def build_payload() -> dict:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    survey_id, options = str(ObjectId()), ["A", "B", "C", "D"]
+    return {
+        "items": [{
+            "id": str(ObjectId()),
+            "survey_id": survey_id,
+            "user_id": str(ObjectId()),
+            "user_name": f"Utilizador {i}",
+            "answers": [
+                {"question_index": 0, "answer": rng.choice(options)},
+                {"question_index": 1, "answer": rng.sample(options, 2)},
+                {"question_index": 2, "answer": rng.randint(1, 5)},
+                {"question_index": 3, "answer": "Comentário livre de um respondente"},
+            ],
+            "submitted_at": now - timedelta(seconds=i)
+        } for i in range(PAYLOAD)],
+        "next_cursor": None
+    }
+
+
+def time_ms(fn) -> list:
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    payload = build_payload()
+    adapter = TypeAdapter(server.Page[server.Response])
+
+    strategies = [
+        ("jsonable_encoder + json", lambda: JSONResponse(jsonable_encoder(payload)).body),
+        ("jsonable_encoder + orjson", lambda: ORJSONResponse(jsonable_encoder(payload)).body),
+        ("response_model + orjson", lambda: ORJSONResponse(
+            adapter.dump_python(adapter.validate_python(payload), mode="json")
+        ).body),
+    ]
+
+    rows = []
+    for name, fn in strategies:
+        body = fn()
+        samples = time_ms(fn)
+        rows.append({
+            "strategy": name,
+            "bytes": len(body),
+            "p50_ms": round(percentile(samples, 50), 2),
+            "max_ms": round(max(samples), 2),
+        })
+
+    print(f"Serializing {PAYLOAD} responses, {ITERATIONS} iterations")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/surveys: per-survey has_answered lookups vs one batched query.
+
+Seeds SURVEYS surveys (default 1000) and a respondent who answered half of them,
+then reports Mongo round trips and p50/p95 latency for both implementations. The
+current endpoint is paginated, so it is measured walking every page.
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_survey_listing.py
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from common import connect, measure, print_table, summarize
+
+import server
+
+SURVEYS = int(os.environ.get("SURVEYS", 1000))
+ITERATIONS = int(os.environ.get("ITERATIONS", 30))
+
+
+async def legacy_get_surveys(current_user: dict):
+    """The original N+1 implementation, kept here for comparison."""
+    db = server.db
+    surveys = await db.surveys.find().sort("created_at", -1).to_list(1000)
+    result = []
+    for survey in surveys:
+        has_answered = await db.responses.find_one({
+            "survey_id": str(survey["_id"]),
+            "user_id": str(current_user["_id"])
+        })
+        end_date = survey.get("end_date")
+        result.append({
+            "id": str(survey["_id"]),
+            "title": survey["title"],
+            "description": survey["description"],
+            "created_at": survey["created_at"],
+            "end_date": end_date,
+            "is_closed": end_date is not None and datetime.utcnow() > end_date,
+            "response_count": survey.get("response_count", 0),
+            "has_answered": has_answered is not None,
+            "featured": survey.get("featured", False)
+        })
+    return result
+
+
+async def batched_get_surveys(current_user: dict):
+    """Walk every page of the current endpoint."""
+    result, cursor = [], None
+    while True:
+        page = await server.get_surveys(limit=server.MAX_PAGE_SIZE, cursor=cursor, current_user=current_user)
+        result.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return result
+
+
+async def seed(db):
+    now = datetime.utcnow()
+    user = {"email": "bench@impar.pt", "name": "Bench", "role": "user", "created_at": now}
+    user["_id"] = (await db.users.insert_one(user)).inserted_id
+
+    surveys = [{
+        "title": f"Sondagem {i}",
+        "description": "Benchmark",
+        "questions": [{"type": "multiple_choice_single", "text": "?", "options": ["A", "B"]}],
+        "created_by": "bench",
+        "created_at": now - timedelta(minutes=i),
+        "response_count": 0,
+        "end_date": None
+    } for i in range(SURVEYS)]
+    result = await db.surveys.insert_many(surveys)
+
+    responses = [{
+        "survey_id": str(survey_id),
+        "user_id": str(user["_id"]),
+        "user_name": user["name"],
+        "answers": [{"question_index": 0, "answer": "A"}],
+        "submitted_at": now
+    } for survey_id in result.inserted_ids[::2]]
+    await db.responses.insert_many(responses)
+    return user
+
+
+async def main():
+    client, db, counter = connect("impar_bench_survey_listing")
+    await client.drop_database(db.name)
+    try:
+        user = await seed(db)
+
+        rows = []
+        for name, fn in [("legacy (N+1)", legacy_get_surveys), ("batched, paginated", batched_get_surveys)]:
+            expected = await fn(current_user=user)
+            counter.reset()
+            await fn(current_user=user)
+            round_trips = counter.count
+            samples = await measure(lambda: fn(current_user=user), ITERATIONS)
+            rows.append(summarize(name, samples, round_trips))
+            assert sum(s["has_answered"] for s in expected) == (SURVEYS + 1) // 2
+
+        print(f"GET /api/surveys with {SURVEYS} surveys, {ITERATIONS} iterations")
+        print_table(rows)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
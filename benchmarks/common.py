@@ -0,0 +1,119 @@
+"""
+Shared helpers for the backend benchmarks.
+
+The benchmarks import `backend/server.py` directly and point its `db` global at a
+throwaway database on a local mongod (MONGO_URL, default mongodb://localhost:27017).
+Every Mongo command issued through that client is counted so round trips can be
+compared between implementations.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import bson
+from pymongo import monitoring
+from starlette.requests import Request
+from starlette.responses import Response
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "impar_bench")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+import server  # noqa: E402
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts Mongo commands (round trips) sent by a client.
+
+    With `measure_bytes` it also sums the BSON size of the replies, which costs an
+    extra encode per reply and so is off by default.
+    """
+
+    def __init__(self, measure_bytes: bool = False):
+        self.measure_bytes = measure_bytes
+        self.count = 0
+        self.by_command = {}
+        self.reply_bytes = 0
+
+    def started(self, event):
+        self.count += 1
+        self.by_command[event.command_name] = self.by_command.get(event.command_name, 0) + 1
+
+    def succeeded(self, event):
+        if self.measure_bytes:
+            self.reply_bytes += len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+    def reset(self):
+        self.count = 0
+        self.by_command = {}
+        self.reply_bytes = 0
+
+
+def connect(db_name: str = None, measure_bytes: bool = False):
+    """Create a monitored client and make `server` use it. Returns (client, db, counter)."""
+    counter = CommandCounter(measure_bytes)
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[counter])
+    db = client[db_name or os.environ["DB_NAME"]]
+    server.client = client
+    server.db = db
+    return client, db, counter
+
+
+def endpoint_context(headers: dict = None) -> dict:
+    """`request`/`response` arguments for calling endpoints that take them directly."""
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return {
+        "request": Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers}),
+        "response": Response(),
+    }
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+async def measure(coro_factory, iterations: int):
+    """Await `coro_factory()` `iterations` times and return per-call latencies in ms."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(name: str, samples, round_trips: int = None) -> dict:
+    row = {
+        "name": name,
+        "iterations": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "max_ms": round(max(samples), 3) if samples else 0.0,
+    }
+    if round_trips is not None:
+        row["round_trips"] = round_trips
+    return row
+
+
+def print_table(rows):
+    if not rows:
+        return
+    keys = list(rows[0].keys())
+    widths = {k: max(len(k), *(len(str(r.get(k, ""))) for r in rows)) for k in keys}
+    print("  ".join(k.ljust(widths[k]) for k in keys))
+    for row in rows:
+        print("  ".join(str(row.get(k, "")).ljust(widths[k]) for k in keys))
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Load test the API against a throwaway local MongoDB.
+
+Boots `server.app` (in-process over ASGI, or behind uvicorn on a local port with
+--http), seeds users, surveys and responses into a fresh database, then drives
+the hot endpoints with concurrent async clients:
+
+  * surveys  - GET  /api/surveys
+  * respond  - POST /api/surveys/{id}/respond   (each request a new user/survey pair)
+  * results  - GET  /api/surveys/{id}/results
+  * login    - POST /api/auth/login
+  * mixed    - all of the above at once, weighted like real traffic
+
+Throughput and p50/p95/p99 latency per scenario are written to a JSON file
+(default benchmarks/results/load-<git commit>.json) so runs can be compared
+across commits:
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/load_test.py --concurrency 50
+    python benchmarks/load_test.py --compare benchmarks/results/load-abc123.json benchmarks/results/load-def456.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from common import ROOT_DIR, connect, percentile, print_table
+
+import server
+
+PASSWORD = "loadtest123"
+SCENARIOS = ["surveys", "respond", "results", "login", "mixed"]
+MIXED_WEIGHTS = {"surveys": 50, "results": 30, "respond": 15, "login": 5}
+
+QUESTIONS = [
+    {"type": "multiple_choice_single", "text": "Partido", "options": ["A", "B", "C", "D"]},
+    {"type": "multiple_choice_multiple", "text": "Temas", "options": ["Saude", "Habitacao", "Economia", "Ensino"]},
+    {"type": "rating", "text": "Avaliacao", "max_rating": 5},
+    {"type": "text_short", "text": "Comentario"},
+]
+
+
+def random_answers(rng: random.Random) -> list:
+    return [
+        {"question_index": 0, "answer": rng.choice(QUESTIONS[0]["options"])},
+        {"question_index": 1, "answer": rng.sample(QUESTIONS[1]["options"], rng.randint(1, 3))},
+        {"question_index": 2, "answer": rng.randint(1, 5)},
+        {"question_index": 3, "answer": "comentario"},
+    ]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def seed(db, args) -> dict:
+    """Seed the database; returns what the scenarios need to build requests."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    # Hash once: hashing every seeded user would dominate the setup time
+    hashed = await server.hash_password(PASSWORD)
+
+    users = [{
+        "email": f"load{i}@impar.pt", "password": hashed, "name": f"Load {i}", "role": "user",
+        "birth_date": "01/01/1980", "gender": "Feminino" if i % 2 else "Masculino", "district": "Lisboa",
+        "created_at": now - timedelta(seconds=i)
+    } for i in range(args.users)]
+    for start in range(0, len(users), 5000):
+        await db.users.insert_many(users[start:start + 5000])
+
+    surveys = [server.build_survey_document(server.SurveyCreate(
+        title=f"Sondagem {i}", description="Teste de carga", questions=QUESTIONS
+    ), {"_id": "load-owner"}) for i in range(args.surveys)]
+    survey_ids = [str(survey_id) for survey_id in (await db.surveys.insert_many(surveys)).inserted_ids]
+
+    # The first `responses_per_survey` users have answered every survey; the rest
+    # are left for the respond scenario
+    respondents = users[:args.responses_per_survey]
+    for survey_id in survey_ids:
+        documents = [{
+            "survey_id": survey_id,
+            "user_id": str(user["_id"]),
+            "user_name": user["name"],
+            "answers": random_answers(rng),
+            "respondent": server.build_respondent_snapshot(user),
+            "submitted_at": now
+        } for user in respondents]
+        for start in range(0, len(documents), 5000):
+            await db.responses.insert_many(documents[start:start + 5000])
+    for survey in await db.surveys.find({}, {"questions": 1}).to_list(None):
+        await server.rebuild_survey_results(survey)
+
+    def token(user):
+        return {"Authorization": f"Bearer {server.create_access_token({'sub': str(user['_id'])})}"}
+
+    fresh_users = users[args.responses_per_survey:]
+    return {
+        "survey_ids": survey_ids,
+        "reader_headers": [token(user) for user in respondents[:100]] or [token(users[0])],
+        "respond_pairs": itertools.product([token(user) for user in fresh_users], survey_ids),
+        "emails": [user["email"] for user in users[:100]],
+    }
+
+
+def request_factories(data: dict) -> dict:
+    """One coroutine factory per scenario, each issuing a single request."""
+    rng = random.Random(7)
+
+    def surveys(http):
+        return http.get("/api/surveys", headers=rng.choice(data["reader_headers"]))
+
+    def results(http):
+        return http.get(f"/api/surveys/{rng.choice(data['survey_ids'])}/results", headers=rng.choice(data["reader_headers"]))
+
+    def respond(http):
+        pair = next(data["respond_pairs"], None)
+        if pair is None:
+            raise RuntimeError("Out of unanswered user/survey pairs, seed more --users")
+        headers, survey_id = pair
+        return http.post(f"/api/surveys/{survey_id}/respond", json={"answers": random_answers(rng)}, headers=headers)
+
+    def login(http):
+        return http.post("/api/auth/login", json={"email": rng.choice(data["emails"]), "password": PASSWORD})
+
+    factories = {"surveys": surveys, "results": results, "respond": respond, "login": login}
+    weighted = [name for name, weight in MIXED_WEIGHTS.items() for _ in range(weight)]
+    factories["mixed"] = lambda http: factories[rng.choice(weighted)](http)
+    return factories
+
+
+async def run_scenario(http, name: str, make_request, concurrency: int, total: int) -> dict:
+    latencies, errors = [], 0
+    remaining = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(remaining) < total:
+            start = time.perf_counter()
+            try:
+                response = await make_request(http)
+                if response.status_code >= 400:
+                    errors += 1
+            except (httpx.HTTPError, RuntimeError):
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def start_uvicorn():
+    """Serve the app on a free local port; returns (server, base_url)."""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    uvicorn_server = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+    asyncio.create_task(uvicorn_server.serve())
+    while not uvicorn_server.started:
+        await asyncio.sleep(0.05)
+    return uvicorn_server, f"http://127.0.0.1:{port}"
+
+
+async def run(args):
+    client, db, _ = connect(args.db_name)
+    await client.drop_database(db.name)
+    uvicorn_server = None
+    try:
+        await server.ensure_indexes()
+        print(f"Seeding {args.users} users, {args.surveys} surveys, {args.responses_per_survey} responses per survey...")
+        data = await seed(db, args)
+        factories = request_factories(data)
+
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        if args.http:
+            uvicorn_server, base_url = await start_uvicorn()
+            http = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+        else:
+            http = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://load-test", timeout=60)
+
+        rows = []
+        async with http:
+            for name in args.scenarios:
+                # Warm caches and connections so the first requests don't skew p99
+                await run_scenario(http, name, factories[name], args.concurrency, min(args.concurrency, args.requests))
+                row = await run_scenario(http, name, factories[name], args.concurrency, args.requests)
+                rows.append(row)
+                print(f"  {name}: {row['throughput_rps']} req/s, p95 {row['p95_ms']} ms, {row['errors']} errors")
+
+        report = {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "config": {
+                "transport": "http" if args.http else "asgi",
+                "users": args.users,
+                "surveys": args.surveys,
+                "responses_per_survey": args.responses_per_survey,
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "bcrypt_rounds": server.BCRYPT_ROUNDS,
+            },
+            "scenarios": {row["scenario"]: row for row in rows},
+        }
+        output = args.output or ROOT_DIR / "benchmarks" / "results" / f"load-{report['commit']}.json"
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print_table(rows)
+        print(f"Wrote {output}")
+    finally:
+        if uvicorn_server:
+            uvicorn_server.should_exit = True
+            await asyncio.sleep(0.2)
+        if not args.keep:
+            await client.drop_database(db.name)
+        client.close()
+
+
+def compare(before_path: str, after_path: str):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    rows = []
+    for name, new in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if not old:
+            continue
+        rows.append({
+            "scenario": name,
+            "rps": f"{old['throughput_rps']} -> {new['throughput_rps']}",
+            "p50_ms": f"{old['p50_ms']} -> {new['p50_ms']}",
+            "p95_ms": f"{old['p95_ms']} -> {new['p95_ms']}",
+            "p99_ms": f"{old['p99_ms']} -> {new['p99_ms']}",
+        })
+    print(f"{before['commit']} -> {after['commit']}")
+    print_table(rows)
+
+
+def main():
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Load test the IMPAR API against a local MongoDB")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--surveys", type=int, default=50)
+    parser.add_argument("--responses-per-survey", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--http", action="store_true", help="Serve the app with uvicorn and load it over HTTP")
+    parser.add_argument("--db-name", default="impar_load_test")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded database")
+    parser.add_argument("--output", help="JSON report path")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two reports and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
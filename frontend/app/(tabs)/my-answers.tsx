@@ -11,7 +11,7 @@ import {
 } from 'react-native';
 import { useRouter, useFocusEffect } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
-import api from '../../utils/api';
+import { fetchAllPages } from '../../utils/api';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { Colors } from '../../constants/colors';
 
@@ -31,8 +31,7 @@ export default function MyAnswersScreen() {
 
   const fetchMyResponses = async () => {
     try {
-      const response = await api.get('/api/my-responses');
-      setResponses(response.data);
+      setResponses(await fetchAllPages('/api/my-responses'));
     } catch (error) {
       console.error('Error fetching my responses:', error);
     } finally {
@@ -18,7 +18,7 @@ import { useAuth } from '../../contexts/AuthContext';
 import { Ionicons } from '@expo/vector-icons';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { Colors, Fonts } from '../../constants/colors';
-import api from '../../utils/api';
+import api, { fetchAllPages } from '../../utils/api';
 
 interface UserProfile {
   id: string;
@@ -83,8 +83,7 @@ export default function ProfileScreen() {
   const fetchTeamApplications = async () => {
     setLoadingApplications(true);
     try {
-      const response = await api.get('/api/admin/team-applications');
-      setTeamApplications(response.data);
+      setTeamApplications(await fetchAllPages('/api/admin/team-applications'));
     } catch (error) {
       console.error('Error fetching team applications:', error);
     } finally {
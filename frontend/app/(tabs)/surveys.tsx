@@ -16,7 +16,7 @@ import {
 } from 'react-native';
 import { useRouter, useFocusEffect } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
-import api from '../../utils/api';
+import api, { fetchAllPages } from '../../utils/api';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { useAuth } from '../../contexts/AuthContext';
 import { Colors, Fonts } from '../../constants/colors';
@@ -51,8 +51,7 @@ export default function SurveysScreen() {
 
   const fetchSurveys = async () => {
     try {
-      const response = await api.get('/api/surveys');
-      setSurveys(response.data);
+      setSurveys(await fetchAllPages('/api/surveys'));
     } catch (error) {
       console.error('Error fetching surveys:', error);
     } finally {
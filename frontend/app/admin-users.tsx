@@ -13,7 +13,7 @@ import {
 } from 'react-native';
 import { useRouter, useFocusEffect } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
-import api from '../utils/api';
+import { fetchAllPages } from '../utils/api';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { Colors, Fonts } from '../constants/colors';
 import { useAuth } from '../contexts/AuthContext';
@@ -51,8 +51,7 @@ export default function AdminUsersScreen() {
 
   const fetchUsers = async () => {
     try {
-      const response = await api.get('/api/admin/users');
-      setUsers(response.data);
+      setUsers(await fetchAllPages('/api/admin/users'));
     } catch (error) {
       console.error('Error fetching users:', error);
     } finally {
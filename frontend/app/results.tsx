@@ -12,7 +12,7 @@ import {
 } from 'react-native';
 import { useRouter, useLocalSearchParams } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
-import api from '../utils/api';
+import api, { fetchAllPages } from '../utils/api';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { BarChart } from 'react-native-chart-kit';
 import { Colors, Fonts } from '../constants/colors';
@@ -64,8 +64,8 @@ export default function ResultsScreen() {
 
   const fetchFeaturedStatus = async () => {
     try {
-      const response = await api.get('/api/surveys');
-      const survey = response.data.find((s: any) => s.id === id);
+      const surveys = await fetchAllPages('/api/surveys');
+      const survey = surveys.find((s: any) => s.id === id);
       if (survey) {
         setFeatured(survey.featured || false);
       }
@@ -13,7 +13,7 @@ import {
 } from 'react-native';
 import { useRouter } from 'expo-router';
 import { Ionicons } from '@expo/vector-icons';
-import api from '../utils/api';
+import api, { fetchAllPages } from '../utils/api';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { Colors, Fonts } from '../constants/colors';
 
@@ -39,8 +39,7 @@ export default function ViewSuggestionsScreen() {
 
   const fetchSuggestions = async () => {
     try {
-      const response = await api.get('/api/suggestions');
-      setSuggestions(response.data);
+      setSuggestions(await fetchAllPages('/api/suggestions'));
     } catch (error) {
       console.error('Error fetching suggestions:', error);
     } finally {
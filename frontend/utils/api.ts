@@ -16,4 +16,17 @@ api.interceptors.request.use(async (config) => {
   return config;
 });
 
+// List endpoints are cursor-paginated ({ items, next_cursor }); follow the
+// cursor until the last page to get the full list.
+export const fetchAllPages = async (url: string, params: Record<string, any> = {}) => {
+  const items: any[] = [];
+  let cursor: string | null = null;
+  do {
+    const response: any = await api.get(url, { params: { ...params, ...(cursor ? { cursor } : {}) } });
+    items.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return items;
+};
+
 export default api;
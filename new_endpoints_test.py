@@ -157,7 +157,7 @@ def get_survey_for_testing(token):
     try:
         response = requests.get(f"{API_BASE}/surveys", headers=headers)
         if response.status_code == 200:
-            surveys = response.json()
+            surveys = response.json().get("items")
             if surveys:
                 return surveys[0]["id"]
     except:
@@ -248,8 +248,8 @@ def test_feature_limit(results):
     try:
         response = requests.get(f"{API_BASE}/surveys", headers=headers)
         if response.status_code == 200:
-            surveys = response.json()
-            if len(surveys) >= 4:  # Need at least 4 surveys to test the limit
+            surveys = response.json().get("items")
+            if surveys and len(surveys) >= 4:  # Need at least 4 surveys to test the limit
                 # Try to feature 4 surveys and check if the 4th fails
                 featured_count = 0
                 for i, survey in enumerate(surveys[:4]):
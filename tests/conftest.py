@@ -0,0 +1,49 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+
+# These tests run against a real local mongod; server.py reads its settings at import time
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "impar_test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+
+@pytest.fixture
+def mongo_url():
+    url = os.environ["MONGO_URL"]
+    try:
+        MongoClient(url, serverSelectionTimeoutMS=500).admin.command("ping")
+    except PyMongoError:
+        pytest.skip(f"MongoDB is not reachable at {url}")
+    return url
+
+
+@pytest.fixture
+def db(mongo_url):
+    """A fresh database with the INDEXES built, and `server` pointed at it."""
+    import server
+
+    client = AsyncIOMotorClient(mongo_url)
+    database = client[os.environ["DB_NAME"]]
+    original_client, original_db = server.client, server.db
+    server.client, server.db = client, database
+    asyncio.run(client.drop_database(database.name))
+    try:
+        asyncio.run(server.ensure_indexes())
+        yield database
+    finally:
+        asyncio.run(client.drop_database(database.name))
+        client.close()
+        server.client, server.db = original_client, original_db
+        server.user_cache.clear()
+        server.survey_cache.clear()
+        server.invalidate_featured_cache()
@@ -0,0 +1,47 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+import server
+
+
+async def export_then_expire(db):
+    owner = {"_id": "owner", "name": "Owner", "role": "owner"}
+    survey_id = str((await db.surveys.insert_one({
+        "title": "Exportada",
+        "description": "Exportação em ficheiro",
+        "questions": [{"type": "multiple_choice_single", "text": "?", "options": ["A", "B"]}],
+        "created_by": "owner",
+        "created_at": datetime.utcnow(),
+        "response_count": 0,
+        "end_date": None
+    })).inserted_id)
+    result = await server.run_export_responses_job({"survey_id": survey_id, "format": "csv"})
+    job_id = (await db.jobs.insert_one({
+        "type": "export_responses", "params": {"survey_id": survey_id, "format": "csv"}, "status": "done",
+        "attempts": 1, "result": result, "created_by": "owner", "created_at": datetime.utcnow()
+    })).inserted_id
+
+    kept = await server.delete_expired_exports()
+    # Age the file past the retention period
+    await db["exports.files"].update_many({}, {"$set": {
+        "uploadDate": datetime.utcnow() - timedelta(seconds=server.EXPORT_RETENTION_SECONDS + 60)
+    }})
+    deleted = await server.delete_expired_exports()
+
+    try:
+        await server.download_job_result(str(job_id), current_user=owner)
+        status_code = 200
+    except HTTPException as e:
+        status_code = e.status_code
+    return kept, deleted, await db["exports.chunks"].count_documents({}), status_code
+
+
+def test_expired_exports_are_deleted(db):
+    kept, deleted, chunks, status_code = asyncio.run(export_then_expire(db))
+
+    assert kept == 0
+    assert deleted == 1
+    assert chunks == 0
+    assert status_code == 410
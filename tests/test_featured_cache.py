@@ -0,0 +1,19 @@
+import asyncio
+
+from starlette.requests import Request
+
+import server
+
+
+def test_featured_build_overtaken_by_an_invalidation_is_not_cached(monkeypatch):
+    async def build_featured_content():
+        # Something is featured while the payload is being built
+        server.invalidate_featured_cache()
+        return [], 60
+
+    monkeypatch.setattr(server, "build_featured_content", build_featured_content)
+    server.invalidate_featured_cache()
+    response = asyncio.run(server.get_featured_content(Request({"type": "http", "method": "GET", "path": "/", "headers": []})))
+
+    assert response.status_code == 200
+    assert server.featured_cache["body"] is None
@@ -0,0 +1,53 @@
+import asyncio
+import json
+from datetime import datetime
+
+from starlette.requests import Request
+
+import server
+
+
+def ndjson_request(lines: list) -> Request:
+    body = "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": []}, receive)
+
+
+async def import_then_backfill(db):
+    owner = {"_id": "owner", "name": "Owner", "role": "owner"}
+    survey_id = str((await db.surveys.insert_one({
+        "title": "Importada",
+        "description": "Respostas de outra plataforma",
+        "questions": [{"type": "multiple_choice_single", "text": "?", "options": ["A", "B"]}],
+        "created_by": "owner",
+        "created_at": datetime.utcnow(),
+        "response_count": 0,
+        "end_date": None
+    })).inserted_id)
+    answers = [{"question_index": 0, "answer": "A"}]
+    # One respondent without an id, one with an id that isn't an account
+    summary = await server.import_responses(survey_id, ndjson_request([
+        {"user_name": "Sem conta", "answers": answers},
+        {"user_id": "external-42", "user_name": "Externo", "answers": answers},
+    ]), current_user=owner)
+
+    # Imported before accountless responses got a snapshot
+    await db.responses.insert_one({
+        "survey_id": "older-import", "user_id": f"import-{server.ObjectId()}", "user_name": "Antigo",
+        "answers": answers, "submitted_at": datetime.utcnow()
+    })
+
+    backfilled = await server.backfill_respondent_snapshots()
+    responses = await db.responses.find({"survey_id": survey_id}).to_list(None)
+    return summary, backfilled, responses
+
+
+def test_accountless_imports_dont_break_the_demographics_backfill(db):
+    summary, backfilled, responses = asyncio.run(import_then_backfill(db))
+
+    assert summary["inserted"] == 2
+    assert backfilled == 0
+    assert all(response["respondent"]["age_band"] == server.UNKNOWN_SEGMENT for response in responses)
@@ -0,0 +1,264 @@
+"""Every query the hot endpoints issue must be served by an index.
+
+Each scenario calls endpoints directly against a seeded database while recording
+the commands they send, then runs every recorded query through explain(). A
+scenario fails if a winning plan contains a COLLSCAN, or if a read examines far
+more documents than it returns (or, for aggregations, than its leading $match
+selects). Maintenance paths that scan on purpose (backfills, rebuilding every
+survey's results) are not covered.
+"""
+
+import asyncio
+import functools
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Response
+from fastapi.security import HTTPAuthorizationCredentials
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient, monitoring
+from starlette.requests import Request
+
+import server
+
+DB_NAME = "impar_test_query_plans"
+PASSWORD = "queryplans123"
+PAGE_SIZE = 20
+USERS = 200
+SURVEYS = 60
+# A read may examine this many documents per document it returns
+MAX_EXAMINED_PER_RETURNED = 3
+
+EXPLAINABLE = {"find", "aggregate", "distinct", "count", "findAndModify", "update", "delete"}
+READS = {"find", "aggregate", "distinct", "count"}
+IGNORED_FIELDS = {"lsid", "txnNumber", "readConcern", "writeConcern"}
+
+QUESTIONS = [
+    {"type": "multiple_choice_single", "text": "Partido", "options": ["A", "B", "C", "D"]},
+    {"type": "rating", "text": "Avaliacao", "max_rating": 5},
+    {"type": "text_short", "text": "Comentario"},
+]
+ANSWERS = [
+    {"question_index": 0, "answer": "A"},
+    {"question_index": 1, "answer": 4},
+    {"question_index": 2, "answer": "comentario"},
+]
+
+
+class CommandRecorder(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        if event.command_name in EXPLAINABLE:
+            self.commands.append({
+                key: value for key, value in event.command.items()
+                if key not in IGNORED_FIELDS and not key.startswith("$")
+            })
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+@functools.lru_cache(maxsize=None)
+def hashed_password() -> str:
+    return asyncio.run(server.hash_password(PASSWORD))
+
+
+def seed(db) -> dict:
+    now = datetime.utcnow()
+    owner = {"email": "owner@impar.pt", "password": hashed_password(), "name": "Owner", "role": "owner", "created_at": now}
+    db.users.insert_one(owner)
+    users = [{
+        "email": f"plan{i}@impar.pt", "password": hashed_password(), "name": f"Plan {i}", "role": "user",
+        "birth_date": "01/01/1980", "gender": "Feminino" if i % 2 else "Masculino", "district": "Lisboa",
+        "created_at": now - timedelta(seconds=i)
+    } for i in range(USERS)]
+    db.users.insert_many(users)
+
+    surveys = []
+    for i in range(SURVEYS):
+        survey = server.build_survey_document(server.SurveyCreate(
+            title=f"Sondagem {i}", description="Planos de consulta", questions=QUESTIONS
+        ), owner)
+        survey["created_at"] = now - timedelta(minutes=i)
+        survey["featured"] = i == 0
+        surveys.append(survey)
+    survey_ids = [str(survey_id) for survey_id in db.surveys.insert_many(surveys).inserted_ids]
+
+    # Every user but the last answered the first survey, the first user answered
+    # every survey, and the last survey has responses of its own to delete
+    def response(user, survey_id, i):
+        return {
+            "survey_id": survey_id, "user_id": str(user["_id"]), "user_name": user["name"], "answers": ANSWERS,
+            "respondent": server.build_respondent_snapshot(user), "submitted_at": now - timedelta(seconds=i)
+        }
+    responses = [response(user, survey_ids[0], i) for i, user in enumerate(users[:-1])]
+    responses += [response(users[0], survey_id, i) for i, survey_id in enumerate(survey_ids[1:])]
+    responses += [response(user, survey_ids[-1], i) for i, user in enumerate(users[1:50])]
+    db.responses.insert_many(responses)
+
+    db.suggestions.insert_many([{
+        "user_id": str(users[i]["_id"]), "user_name": users[i]["name"], "category": "Política",
+        "question_type": "multiple_choice_single", "question_text": "Sugestão?", "options": ["A", "B"],
+        "created_at": now - timedelta(minutes=i), "status": "pending"
+    } for i in range(SURVEYS)])
+    db.team_applications.insert_many([{
+        "user_id": str(users[i]["_id"]), "user_name": users[i]["name"], "user_email": users[i]["email"],
+        "message": "Quero ajudar", "created_at": now - timedelta(minutes=i)
+    } for i in range(SURVEYS)])
+    db.news.insert_many([{
+        "title": f"Notícia {i}", "description": "Texto", "featured": i == 0, "created_at": now - timedelta(minutes=i)
+    } for i in range(SURVEYS)])
+    db.jobs.insert_many([{
+        "type": "rebuild_results", "params": {"survey_id": survey_ids[i]}, "status": "queued" if i < 2 else "done",
+        "attempts": 0, "created_by": str(owner["_id"]), "created_at": now - timedelta(minutes=i)
+    } for i in range(SURVEYS)])
+    db.profiles.insert_many([{
+        "method": "GET", "path": "/api/surveys", "route": "/api/surveys", "status": 200,
+        "duration_ms": 12.5, "created_at": now - timedelta(minutes=i)
+    } for i in range(SURVEYS)])
+
+    return {"owner": owner, "user": users[0], "fresh_user": users[-1], "survey_id": survey_ids[0], "survey_ids": survey_ids}
+
+
+def endpoint_context() -> dict:
+    return {"request": Request({"type": "http", "method": "GET", "path": "/", "headers": []}), "response": Response()}
+
+
+async def page_through(endpoint, *args, **kwargs):
+    """Fetch two pages, so both the first-page and the cursor query shapes run."""
+    page = await endpoint(*args, limit=PAGE_SIZE, cursor=None, **kwargs)
+    assert page["next_cursor"], "seed more documents so the endpoint has a second page"
+    await endpoint(*args, limit=PAGE_SIZE, cursor=page["next_cursor"], **kwargs)
+
+
+async def current_user(data):
+    token = server.create_access_token({"sub": str(data["user"]["_id"])})
+    await server.get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+async def export(data):
+    response = await server.export_responses(data["survey_id"], export_format="csv", current_user=data["owner"])
+    async for _ in response.body_iterator:
+        pass
+
+
+async def rebuild_results(data):
+    await server.rebuild_survey_results(await server.get_survey_definition(data["survey_id"]))
+
+
+async def toggle_feature(data):
+    # Twice, to run both the feature and the unfeature paths
+    for _ in range(2):
+        await server.toggle_survey_feature(data["survey_ids"][1], current_user=data["owner"])
+
+
+SCENARIOS = {
+    "get_current_user": current_user,
+    "login": lambda data: server.login(server.UserLogin(email=data["user"]["email"], password=PASSWORD)),
+    "list_surveys": lambda data: page_through(server.get_surveys, current_user=data["user"]),
+    "get_survey": lambda data: server.get_survey(data["survey_id"], current_user=data["user"], **endpoint_context()),
+    "survey_results": lambda data: server.get_survey_results(data["survey_id"], current_user=data["owner"], **endpoint_context()),
+    "rebuild_results": rebuild_results,
+    "submit_response": lambda data: server.submit_response(
+        data["survey_id"], server.ResponseCreate(answers=ANSWERS), current_user=data["fresh_user"]
+    ),
+    "my_responses": lambda data: page_through(server.get_my_responses, current_user=data["user"]),
+    "survey_responses": lambda data: page_through(server.get_all_responses, data["survey_id"], current_user=data["owner"]),
+    "crosstab": lambda data: server.get_survey_crosstab(
+        data["survey_id"], question_index=0, dimensions="gender,age_band", current_user=data["owner"]
+    ),
+    "export": export,
+    "admin_users": lambda data: page_through(server.get_all_users, current_user=data["owner"]),
+    "suggestions": lambda data: page_through(server.get_all_suggestions, current_user=data["owner"]),
+    "team_applications": lambda data: page_through(server.get_team_applications, current_user=data["owner"]),
+    "news": lambda data: page_through(server.get_all_news, current_user=data["owner"]),
+    "featured": lambda data: server.get_featured_content(endpoint_context()["request"]),
+    "toggle_feature": toggle_feature,
+    "jobs": lambda data: page_through(server.get_jobs, current_user=data["owner"]),
+    "claim_job": lambda data: server.claim_next_job(),
+    "delete_survey_data": lambda data: server.run_delete_survey_data_job({"survey_id": data["survey_ids"][-1]}),
+    "profiles": lambda data: page_through(server.get_profiles, current_user=data["owner"]),
+}
+
+
+async def record_commands(mongo_url: str, scenario, data: dict) -> list:
+    recorder = CommandRecorder()
+    client = AsyncIOMotorClient(mongo_url, event_listeners=[recorder])
+    original_client, original_db = server.client, server.db
+    server.client, server.db = client, client[DB_NAME]
+    server.user_cache.clear()
+    server.survey_cache.clear()
+    server.invalidate_featured_cache()
+    try:
+        await scenario(data)
+    finally:
+        client.close()
+        server.client, server.db = original_client, original_db
+        server.user_cache.clear()
+        server.survey_cache.clear()
+        server.invalidate_featured_cache()
+    return recorder.commands
+
+
+def find_values(node, key):
+    """Every value stored under `key`, at any depth of an explain document."""
+    if isinstance(node, dict):
+        for k, value in node.items():
+            if k == key:
+                yield value
+            yield from find_values(value, key)
+    elif isinstance(node, list):
+        for item in node:
+            yield from find_values(item, key)
+
+
+def check_plan(db, command: dict) -> list:
+    command_name, collection_name = next(iter(command.items()))
+    explain = db.command({"explain": command, "verbosity": "executionStats"})
+    label = f"{command_name} on {collection_name}: {json.dumps(command, default=str)[:300]}"
+    problems = []
+
+    stages = {stage for plan in find_values(explain, "winningPlan") for stage in find_values(plan, "stage")}
+    if "COLLSCAN" in stages:
+        problems.append(f"COLLSCAN - {label}")
+
+    if command_name in READS:
+        stats = list(find_values(explain, "executionStats"))
+        examined = sum(s.get("totalDocsExamined", 0) for s in stats)
+        if command_name == "aggregate":
+            # A fully pushed-down pipeline reports its output, not what it matched
+            first_stage = command["pipeline"][0] if command["pipeline"] else {}
+            if "$match" not in first_stage:
+                return problems
+            returned = db[collection_name].count_documents(first_stage["$match"])
+        else:
+            returned = sum(s.get("nReturned", 0) for s in stats)
+        if examined > MAX_EXAMINED_PER_RETURNED * max(returned, 1):
+            problems.append(f"examined {examined} documents for {returned} - {label}")
+    return problems
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_queries_use_indexes(mongo_url, name):
+    client = MongoClient(mongo_url)
+    db = client[DB_NAME]
+    client.drop_database(DB_NAME)
+    try:
+        for collection_name, indexes in server.INDEXES.items():
+            db[collection_name].create_indexes(indexes)
+        data = seed(db)
+
+        commands = asyncio.run(record_commands(mongo_url, SCENARIOS[name], data))
+        assert commands, f"{name} issued no queries"
+
+        problems = [problem for command in commands for problem in check_plan(db, command)]
+        assert not problems, "\n".join(problems)
+    finally:
+        client.drop_database(DB_NAME)
+        client.close()
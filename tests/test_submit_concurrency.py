@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime
+
+from fastapi import HTTPException
+
+import server
+
+PARALLEL_SUBMITS = 1000
+
+
+async def submit_in_parallel(db):
+    now = datetime.utcnow()
+    user = {"email": "voter@impar.pt", "name": "Voter", "role": "user", "created_at": now}
+    user["_id"] = (await db.users.insert_one(user)).inserted_id
+    survey_id = str((await db.surveys.insert_one({
+        "title": "Concorrência",
+        "description": "Um voto por pessoa",
+        "questions": [{"type": "multiple_choice_single", "text": "?", "options": ["Sim", "Não"]}],
+        "created_by": "owner",
+        "created_at": now,
+        "response_count": 0,
+        "end_date": None
+    })).inserted_id)
+
+    response = server.ResponseCreate(answers=[{"question_index": 0, "answer": "Sim"}])
+    outcomes = await asyncio.gather(*[
+        server.submit_response(survey_id, response, current_user=user)
+        for _ in range(PARALLEL_SUBMITS)
+    ], return_exceptions=True)
+
+    stored = {
+        "responses": await db.responses.count_documents({"survey_id": survey_id}),
+        "response_count": (await db.surveys.find_one({"_id": server.ObjectId(survey_id)}))["response_count"],
+        "results": await db.survey_results.find_one({"_id": survey_id}),
+    }
+    return outcomes, stored
+
+
+def test_parallel_submits_from_same_user_land_once(db):
+    outcomes, stored = asyncio.run(submit_in_parallel(db))
+
+    accepted = [o for o in outcomes if isinstance(o, dict)]
+    rejected = [o for o in outcomes if isinstance(o, HTTPException)]
+    assert len(accepted) == 1
+    assert len(rejected) == PARALLEL_SUBMITS - 1
+    assert all(e.status_code == 409 for e in rejected)
+
+    assert stored["responses"] == 1
+    assert stored["response_count"] == 1
+    assert stored["results"]["total_responses"] == 1
+    assert stored["results"]["questions"]["0"]["options"]["0"] == 1
+
+
+async def bootstrap_indexes_over_duplicates(db):
+    # A database from before the unique index, with a user who answered three times
+    await db.responses.drop_index("survey_user_unique")
+    now = datetime.utcnow()
+    survey_id = str((await db.surveys.insert_one({
+        "title": "Duplicados",
+        "description": "Respostas repetidas de antes do índice único",
+        "questions": [{"type": "multiple_choice_single", "text": "?", "options": ["Sim", "Não"]}],
+        "created_by": "owner",
+        "created_at": now,
+        "response_count": 3,
+        "end_date": None
+    })).inserted_id)
+    await db.responses.insert_many([{
+        "survey_id": survey_id,
+        "user_id": "voter",
+        "user_name": "Voter",
+        "answers": [{"question_index": 0, "answer": "Sim"}],
+        "submitted_at": now
+    } for _ in range(3)])
+
+    try:
+        await server.ensure_indexes()
+        refused = False
+    except RuntimeError:
+        refused = True
+
+    deleted = await server.dedupe_responses()
+    await server.ensure_indexes()
+    indexes = await db.responses.index_information()
+    return refused, deleted, "survey_user_unique" in indexes, await db.survey_results.find_one({"_id": survey_id})
+
+
+def test_startup_refuses_to_run_without_unique_responses_index(db):
+    refused, deleted, indexed, results = asyncio.run(bootstrap_indexes_over_duplicates(db))
+
+    assert refused
+    assert deleted == 2
+    assert indexed
+    assert results["total_responses"] == 1
@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime
+
+from fastapi import HTTPException
+
+import server
+
+EXISTING_RESPONSES = 5
+
+
+async def vote_on_survey_answered_before_preaggregation(db):
+    now = datetime.utcnow()
+    survey_id = str((await db.surveys.insert_one({
+        "title": "Antiga",
+        "description": "Respondida antes dos resultados agregados",
+        "questions": [{"type": "multiple_choice_single", "text": "?", "options": ["A", "B"]}],
+        "created_by": "owner",
+        "created_at": now,
+        "response_count": EXISTING_RESPONSES,
+        "end_date": None
+    })).inserted_id)
+    # Responses from before survey_results existed: no results document
+    await db.responses.insert_many([{
+        "survey_id": survey_id,
+        "user_id": f"legacy-{i}",
+        "user_name": f"Legacy {i}",
+        "answers": [{"question_index": 0, "answer": "A"}],
+        "submitted_at": now
+    } for i in range(EXISTING_RESPONSES)])
+
+    rebuilt = await server.rebuild_missing_survey_results()
+    user = {"_id": "voter", "name": "Voter", "role": "user"}
+    response = server.ResponseCreate(answers=[{"question_index": 0, "answer": "B"}])
+    await server.submit_response(survey_id, response, current_user=user)
+
+    return rebuilt, await db.survey_results.find_one({"_id": survey_id})
+
+
+def test_vote_on_survey_with_older_responses_counts_them_all(db):
+    rebuilt, results = asyncio.run(vote_on_survey_answered_before_preaggregation(db))
+
+    assert rebuilt == 1
+    assert results["total_responses"] == EXISTING_RESPONSES + 1
+    assert results["questions"]["0"]["options"] == {"0": EXISTING_RESPONSES, "1": 1}
+
+
+async def vote_on_survey_deleted_behind_the_cache(db):
+    survey_id = str((await db.surveys.insert_one({
+        "title": "Apagada",
+        "description": "Apagada noutro worker",
+        "questions": [{"type": "multiple_choice_single", "text": "?", "options": ["A", "B"]}],
+        "created_by": "owner",
+        "created_at": datetime.utcnow(),
+        "response_count": 0,
+        "end_date": None
+    })).inserted_id)
+    # Cache the definition here, then delete the survey as another worker would
+    await server.get_survey_definition(survey_id)
+    await db.surveys.delete_one({"_id": server.ObjectId(survey_id)})
+
+    user = {"_id": "voter", "name": "Voter", "role": "user"}
+    response = server.ResponseCreate(answers=[{"question_index": 0, "answer": "A"}])
+    try:
+        await server.submit_response(survey_id, response, current_user=user)
+        status_code = 200
+    except HTTPException as e:
+        status_code = e.status_code
+
+    return status_code, await db.responses.count_documents({}), await db.survey_results.count_documents({})
+
+
+def test_vote_on_deleted_survey_leaves_no_data(db):
+    status_code, responses, results = asyncio.run(vote_on_survey_deleted_behind_the_cache(db))
+
+    assert status_code == 404
+    assert responses == 0
+    assert results == 0
+
+
+def test_only_valid_ratings_are_counted():
+    survey = {"questions": [{"type": "rating", "text": "Avaliação", "max_rating": 5}]}
+    counted = [4, 4.5, 5.0]
+    rejected = [True, False, 1e20, 1e-07, float("nan"), float("inf"), 0, 6, "3", [3]]
+
+    totals = {}
+    for value in counted + rejected:
+        for path, amount in server.build_results_increments(survey["questions"], [{"question_index": 0, "answer": value}]).items():
+            totals[path] = totals.get(path, 0) + amount
+    results = server.format_survey_results(survey, server.expand_results_increments(totals))[0]["results"]
+
+    assert totals["questions.0.rating_count"] == len(counted)
+    assert results["distribution"] == {4: 1, 4.5: 1, 5.0: 1}
+    assert results["average"] == sum(counted) / len(counted)